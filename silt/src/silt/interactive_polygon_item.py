@@ -54,6 +54,93 @@ Note
 """
 
 
+def polygon_from_points(pts) -> QPolygonF:
+    """Build a QPolygonF from a list or array of (x, y) points.
+    
+    The points are copied straight into the polygon's buffer,
+    rather than constructing a QPointF for each point.
+    """
+    pts = np.asarray(pts, dtype=np.float64).reshape(-1, 2)
+    poly = QPolygonF(len(pts))
+    if len(pts) != 0:
+        # QPointF is laid out as two doubles
+        buf = poly.data()
+        buf.setsize(pts.nbytes)
+        np.frombuffer(buf, dtype=np.float64).reshape(-1, 2)[:] = pts
+    return poly
+
+
+def points_from_polygon(poly: QPolygonF) -> np.ndarray:
+    """Copy the points of a QPolygonF into an (N, 2) float64 array.
+    """
+    if poly.count() == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    buf = poly.data()
+    buf.setsize(poly.count() * 2 * np.dtype(np.float64).itemsize)
+    return np.frombuffer(buf, dtype=np.float64).reshape(-1, 2).copy()
+
+
+def polygon_covered_pixels(vertices: np.ndarray,
+                           x_start: int, x_stop: int,
+                           y_start: int, y_stop: int):
+    """Get the integer pixel coordinates in [x_start, x_stop) x
+    [y_start, y_stop) that are inside the polygon.
+    
+    Matches QPolygonF.containsPoint(pt, Qt.WindingFill) for every
+    pixel, but evaluates all of them at once: each edge crossing a
+    row adds its direction to the winding number of every pixel at
+    or right of the crossing.
+    
+    Parameters
+    ----------
+    vertices: numpy.ndarray
+        (N, 2) array of polygon vertices. The polygon is closed
+        implicitly if the last vertex differs from the first.
+    
+    Returns
+    -------
+    list of (x, y) tuples, ordered by row and then by column.
+    """
+    width = x_stop - x_start
+    height = y_stop - y_start
+    if len(vertices) == 0 or width <= 0 or height <= 0:
+        return []
+    
+    # Edges, closing the polygon if needed
+    if np.array_equal(vertices[-1], vertices[0]):
+        starts, ends = vertices[:-1], vertices[1:]
+    else:
+        starts, ends = vertices, np.roll(vertices, -1, axis=0)
+    x1, y1 = starts[:, 0], starts[:, 1]
+    x2, y2 = ends[:, 0], ends[:, 1]
+    
+    # Ignore horizontal edges, with Qt's fuzzy comparison
+    keep = ~(np.abs(y1 - y2) * 1e12 <= np.minimum(np.abs(y1), np.abs(y2)))
+    x1, y1, x2, y2 = x1[keep], y1[keep], x2[keep], y2[keep]
+    
+    # Orient every edge downwards, remembering its direction
+    direction = np.where(y2 < y1, -1, 1)
+    flip = direction < 0
+    x1, x2 = np.where(flip, x2, x1), np.where(flip, x1, x2)
+    y1, y2 = np.where(flip, y2, y1), np.where(flip, y1, y2)
+    
+    # Rows crossed by each edge, half-open at the bottom
+    ys = np.arange(y_start, y_stop, dtype=np.float64)[:, np.newaxis]
+    crosses = (ys >= y1) & (ys < y2)
+    rows, edges = np.nonzero(crosses)
+    x_cross = (x1[edges] + ((x2[edges] - x1[edges]) / (y2[edges] - y1[edges]))
+               * (ys[rows, 0] - y1[edges]))
+    
+    # A pixel x counts the crossing if x_cross <= x, i.e. from ceil(x_cross) on
+    cols = np.clip(np.ceil(x_cross) - x_start, 0, width).astype(np.intp)
+    winding = np.zeros((height, width + 1), dtype=np.int32)
+    np.add.at(winding, (rows, cols), direction[edges])
+    inside = np.cumsum(winding[:, :width], axis=1) != 0
+    
+    py, px = np.nonzero(inside)
+    return list(zip((px + x_start).tolist(), (py + y_start).tolist()))
+
+
 class InteractivePolygon(QGraphicsPolygonItem):
     
     item_type = 'polygon'
@@ -362,28 +449,35 @@ class InteractivePolygon(QGraphicsPolygonItem):
         #if verts[-1] != verts[0]:
         #    verts.append(verts[0])
 
-        poly = self.mapToScene(self.polygon())
-        pts = [poly.value(i) for i in range(poly.count())]
-        if pts[0] != pts[-1]:
+        # Copy all the points at once, rather than one QPointF at a time
+        pts = points_from_polygon(self.mapToScene(self.polygon())).tolist()
+        # Compared like QPointF, which ignores differences under 1e-12
+        if len(pts) != 0 and not np.allclose(pts[0], pts[-1], rtol=0, atol=1e-12):
             pts.append(pts[0])
-        verts = [(pt.x(), pt.y()) for pt in pts]
+        verts = [(x, y) for x, y in pts]
             
         return verts
     
     
+    def getVertex(self, ind):
+        """Get the center of the vertex at ind, in the same
+        scene coordinates as getVertices().
+        """
+        pt = self.mapToScene(self.polygon().value(ind))
+        return (pt.x(), pt.y())
+    
+    
     def getCoveredPixels(self):
         """Get the list of pixel coordinates that are covered by the polygon.
         """
-        poly = self.mapToScene(self.polygon())
+        poly = points_from_polygon(self.mapToScene(self.polygon()))
         rect = self.polygon().boundingRect()
-        covered_px = []
-        for y in range(int(self.mapToScene(rect.topLeft()).y()),
-                       int(self.mapToScene(rect.bottomLeft()).y()) + 1):
-            for x in range(int(self.mapToScene(rect.topLeft()).x()),
-                           int(self.mapToScene(rect.topRight()).x()) + 1):
-                if poly.containsPoint(QPointF(x, y), Qt.WindingFill):
-                    covered_px.append((x, y))
-        return covered_px
+        top_left = self.mapToScene(rect.topLeft())
+        return polygon_covered_pixels(poly,
+                                      int(top_left.x()),
+                                      int(self.mapToScene(rect.topRight()).x()) + 1,
+                                      int(top_left.y()),
+                                      int(self.mapToScene(rect.bottomLeft()).y()) + 1)
     
     
     def getUUID(self):
@@ -464,15 +558,13 @@ class InteractivePolygon(QGraphicsPolygonItem):
     def getBoundingRect(self):
         """Set up to return the bounding rect corners as a list
         """
-        rect = self.polygon().boundingRect()
-        corners = [(int(self.mapToScene(rect.topLeft()).x()),
-                    int(self.mapToScene(rect.topLeft()).y())),
-                   (int(np.ceil(self.mapToScene(rect.topRight()).x())),
-                    int(self.mapToScene(rect.topRight()).y())),
-                   (int(np.ceil(self.mapToScene(rect.bottomRight()).x())),
-                    int(np.ceil(self.mapToScene(rect.bottomRight()).y()))),
-                   (int(self.mapToScene(rect.bottomLeft()).x()),
-                    int(np.ceil(self.mapToScene(rect.bottomLeft()).y())))]
+        if self.polygon().count() == 0:
+            return [(0, 0)] * 4
+        # Reduce the scene vertices once, instead of mapping each corner
+        pts = points_from_polygon(self.mapToScene(self.polygon()))
+        x0, y0 = pts.min(axis=0).astype(int).tolist()
+        x1, y1 = np.ceil(pts.max(axis=0)).astype(int).tolist()
+        corners = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
         return corners
 
     
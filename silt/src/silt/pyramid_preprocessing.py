@@ -14,10 +14,15 @@ def generate_pyramid(file_path: str,
                      blocksize = 2**12,
                      max_length = 1024,
                      progress_callback: pyqtSignal = None,
-                     no_pyramid: bool = False):
+                     no_pyramid: bool = False,
+                     chunk_size: int = 512):
     """
     Given a path to an h5 file, generates an image pyramid in the group "pyramid" within the
     same file.
+
+    chunk_size is the size of the tiles the viewer reads, in original image pixels. The viewer
+    scales level z up by downsample**z, so each of its tiles covers chunk_size / downsample**z
+    pixels of the level, and the level is chunked in blocks of that size.
     """
     if sigma is None:
         sigma = 2 * downsample / 6.0
@@ -64,6 +69,7 @@ def generate_pyramid(file_path: str,
                     sigma=sigma,
                     radius=radius,
                     progress_callback=progress_callback,
+                    chunk_size=max(chunk_size // downsample**(i+1), 1),
                 )
 
                 h5_image.attrs["image_min"] = image_min
@@ -78,6 +84,7 @@ def generate_pyramid(file_path: str,
                     sigma=sigma,
                     radius=radius,
                     progress_callback=progress_callback,
+                    chunk_size=max(chunk_size // downsample**(i+1), 1),
                 )
 
 
@@ -90,12 +97,13 @@ def block_filter_to_pyramid(
     sigma: int=None,
     radius: int=3,
     progress_callback: pyqtSignal = None,
+    chunk_size: int=512,
 ):
     """
     Generates a level of the image pyramid.
 
     Given an input image and an output destination/target, downsamples the image 
-    and saves to the group.
+    and saves to the group, chunked in blocks of at most chunk_size x chunk_size.
     """
     
     dim = len(input_image.shape)
@@ -114,13 +122,15 @@ def block_filter_to_pyramid(
     else:
         N_output = N // 2 + 1
 
+    chunks = (min(chunk_size, M_output), min(chunk_size, N_output))
     if dim == 3:
         target_shape = (M_output, N_output, input_image.shape[2])
+        chunks = chunks + (input_image.shape[2],)
     else:
         target_shape = (M_output, N_output)
 
     output_destination.create_dataset(
-        target, shape=target_shape, dtype=input_image.dtype
+        target, shape=target_shape, dtype=input_image.dtype, chunks=chunks
     )
 
     image_min = None
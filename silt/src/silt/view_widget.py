@@ -14,19 +14,68 @@
 
 from PyQt5.QtWidgets import (QGraphicsView, QGraphicsScene, 
                              QGraphicsItem, QUndoCommand,
-                             QGraphicsLineItem)
+                             QGraphicsLineItem, QGraphicsItemGroup)
 from PyQt5.QtGui import (QImage, QPixmap, QPolygonF,
-                         QPen, QColor)
-from PyQt5.QtCore import (Qt, QPointF, QPoint, QRectF, pyqtSignal)
+                         QPen, QColor, QTransform)
+from PyQt5.QtCore import (Qt, QPointF, QPoint, QRectF, pyqtSignal,
+                          QRunnable, QThreadPool, QTimer, QObject)
+from PyQt5 import sip
 import h5py
-from .interactive_polygon_item import InteractivePolygon
+from .interactive_polygon_item import (InteractivePolygon, polygon_from_points,
+                                       points_from_polygon)
+import inspect
 import numpy as np
+import os
 import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 import logging
 from . import utils
 
-logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# HDF5 raw data chunk cache of the opened image file. Each dataset gets its own
+# cache, large enough to hold the chunks under a screenful of 512 x 512 tiles
+# as the user pans. The slot count is a prime, ~100x the number of chunks held.
+H5_CHUNK_CACHE_BYTES = 64 * 1024**2
+H5_CHUNK_CACHE_SLOTS = 25013
+
+
+def _can_read_chunks_into_buffer():
+    """Whether this h5py can read raw chunks straight into a given buffer, with
+    DatasetID.read_direct_chunk(..., out=...)."""
+    try:
+        return "out" in inspect.signature(h5py.h5d.DatasetID.read_direct_chunk).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+
+H5_READ_CHUNKS_INTO_BUFFER = _can_read_chunks_into_buffer()
+
+
+# Number of pixels sampled from the viewport to set the image levels automatically
+AUTO_LEVELS_SAMPLES = 1 << 16
+
+# Number of rendered crops kept, to redisplay recently visited views
+RENDER_CACHE_SIZE = 8
+
+# Size of the coarsest level of the in-memory pyramid built for images without one
+RUNTIME_PYRAMID_BYTES = 16 * 1024**2
+
+# Image levels of large crops are computed in row bands of at least this many
+# pixels, in parallel. NumPy releases the GIL for the arithmetic and lookups.
+LEVELS_BAND_PIXELS = 1 << 18
+LEVELS_THREADS = os.cpu_count() or 1
+_levels_executor = None
+
+
+def _get_levels_executor():
+    """Thread pool shared by all image items to compute image levels."""
+    global _levels_executor
+    if _levels_executor is None:
+        _levels_executor = ThreadPoolExecutor(max_workers=LEVELS_THREADS, 
+                                              thread_name_prefix="silt-levels")
+    return _levels_executor
 
 
 #####################################################
@@ -53,6 +102,9 @@ class ViewWidget(QGraphicsView):
     base_image_item: BaseImageGraphicsItem
     label_items: list
     overlay_items: list
+    overlay_item_groups: list of QGraphicsItemGroup
+        The parent of each overlay item's line segments, in the
+        same order as overlay_items.
     scene: QGraphicsScene
     """
     
@@ -76,6 +128,8 @@ class ViewWidget(QGraphicsView):
         super(ViewWidget, self).__init__(parent)
         
         self.base_image_item = None
+        # Image chip of the last refinement, reused when the next one is the same size
+        self._chip_buf = None
         
         if label_items:
             self.label_items = label_items
@@ -86,8 +140,20 @@ class ViewWidget(QGraphicsView):
             self.overlay_items = overlay_items
         else:
             self.overlay_items = []
+        self.overlay_item_groups = []
         
         self.poly_assist_configs = {'method':None,'options':None}     
+        # Zoom scale of the vertex diameters, and the (zoom level, zoom factor) it was computed for
+        self._vertex_diameter_scale = 1.0
+        self._vertex_diameter_scale_key = None
+        # When True, addPolygon leaves the scene update to the caller
+        self._batch_mode = False
+        # Coalesces image window updates from bursts of key repeats and mouse 
+        # releases into one, about a display frame after the last of them
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(16)
+        self.update_timer.timeout.connect(self._onUpdateImageWindow)
         self._initScene()
         
         if image_file is not None:
@@ -127,6 +193,44 @@ class ViewWidget(QGraphicsView):
         self.scene = QGraphicsScene(self)
         self.setScene(self.scene)
         self.setDragMode(QGraphicsView.ScrollHandDrag)
+        # The image item sits under every label item, so a change anywhere repaints
+        # part of it. Repaint the whole viewport at once rather than tracking the
+        # dirty regions of many label items.
+        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+
+        # Selected label item indices, rebuilt lazily after the selection or
+        # the label item list changes
+        self._selected_indices = None
+        self._item_to_index = None
+        self.scene.selectionChanged.connect(self._onSelectionChanged)
+
+    def _getVertexDiameterScale(self, zoom_level: int):
+        """Get the scale applied to the vertex diameters at zoom_level,
+        only recomputing it when the zoom changes.
+        """
+        key = (zoom_level, self.zoom_factor)
+        if key != self._vertex_diameter_scale_key:
+            self._vertex_diameter_scale = self.zoom_factor ** (zoom_level + 1)
+            self._vertex_diameter_scale_key = key
+        return self._vertex_diameter_scale
+
+    def _invalidateItemIndices(self):
+        """Mark the label item -> index lookup as stale. Must be called
+        whenever label items are added, removed or reordered.
+        """
+        self._item_to_index = None
+        self._selected_indices = None
+
+    def _selectedLabelItemIndices(self):
+        """Get the sorted indices of the selected label items.
+        """
+        if self._selected_indices is None:
+            if self._item_to_index is None:
+                self._item_to_index = {item: i for i, item in enumerate(self.label_items)}
+            self._selected_indices = sorted(self._item_to_index[item]
+                                            for item in self.scene.selectedItems()
+                                            if item in self._item_to_index)
+        return self._selected_indices
     
     ##########################################################
     # PUBLIC
@@ -138,6 +242,7 @@ class ViewWidget(QGraphicsView):
         empty list.
         """
         
+        self._invalidateItemIndices()
         if label_items is None:
             self.label_items = []
         
@@ -148,22 +253,22 @@ class ViewWidget(QGraphicsView):
     def setLabelItemStyleOptions(self, label_item_style_options: dict):
         """Set up the style of the overlay items.
         """
-        if 'line_width' in label_item_style_options.keys():
-            self.label_item_line_width = label_item_style_options['line_width']
-        if 'vertex_diameter' in label_item_style_options.keys():
-            self.label_item_vertex_diameter = label_item_style_options['vertex_diameter']
-        if 'line_color' in label_item_style_options.keys():
-            self.label_item_line_color = label_item_style_options['line_color']
-        if 'vertex_color' in label_item_style_options.keys():
-            self.label_item_vertex_color = label_item_style_options['vertex_color']
-        
+        self.label_item_line_width = label_item_style_options.get('line_width',
+                                                                  self.label_item_line_width)
+        self.label_item_vertex_diameter = label_item_style_options.get('vertex_diameter',
+                                                                       self.label_item_vertex_diameter)
+        self.label_item_line_color = label_item_style_options.get('line_color',
+                                                                  self.label_item_line_color)
+        self.label_item_vertex_color = label_item_style_options.get('vertex_color',
+                                                                    self.label_item_vertex_color)
+        
+        # The setters don't schedule a redraw, so invalidate the scene once for all items
         for item in self.label_items:
             item.setLineWidth(self.label_item_line_width)
             item.setVertexDiameter(self.label_item_vertex_diameter)
             item.setLineColor(self.label_item_line_color)
             item.setVertexColor(self.label_item_vertex_color)
-        
-        self.scene.update(self.scene.sceneRect())
+        self.scene.update()
     
     
     def wheelEvent(self, event):
@@ -174,29 +279,32 @@ class ViewWidget(QGraphicsView):
 
 
     def _update_zoom(self, pt: QPoint):
+        # Viewport bounds before scaling, used to limit the zoom
+        if self.base_image_item is not None and pt.y() != 0:
+            bounds = self.mapToScene(self.viewport().geometry()).boundingRect()
+            bounds_width = bounds.width()
+            bounds_height = bounds.height()
+
         # Zoom in
         if pt.y() > 0:
-            if self.base_image_item is not None:
-                bounds = self.mapToScene(self.viewport().geometry()).boundingRect()
-                # If view bounds are smaller than a pixel, stop zoom
-                if (bounds.height() < 1 or
-                    bounds.width() < 1):
-                    return
+            # If view bounds are smaller than a pixel, stop zoom
+            if self.base_image_item is not None and (bounds_height < 1 or bounds_width < 1):
+                return
             self.scale(self.zoom_factor, self.zoom_factor)
             self.current_zoom_level -= 1
         # Zoom out
         elif pt.y() < 0:
+            # If view bounds are larger than the size of the image, stop zoom
             if self.base_image_item is not None:
-                bounds = self.mapToScene(self.viewport().geometry()).boundingRect()
-                # If view bounds are larger than the size of the image, stop zoom
-                if (((bounds.width()) > self.scene.width() and
-                    (bounds.height()) > self.scene.height())):
+                scene_rect = self.scene.sceneRect()
+                if bounds_width > scene_rect.width() and bounds_height > scene_rect.height():
                     return
             self.scale((1/self.zoom_factor), (1/self.zoom_factor))
             self.current_zoom_level += 1
 
-        bounds = self.mapToScene(self.viewport().geometry()).boundingRect()
         if self.base_image_item is not None:
+            # The scale changed the mapping, so the bounds must be taken again
+            bounds = self.mapToScene(self.viewport().geometry()).boundingRect()
             self.base_image_item.update_image_window(new_coordinates=bounds, 
                                                      new_zoom_level=self.current_zoom_level,
                                                      zoom_factor=self.zoom_factor)
@@ -219,21 +327,10 @@ class ViewWidget(QGraphicsView):
         shadow - min image value currently set, used for syncing UI with image
         mid - mid image value currently set, used for syncing UI with image
         highlight - max image value currently set, used for syncing UI with image
-        no_pyramid - False if pyramid isn't being used, won't dynamically load tiles
+        no_pyramid - True if the file has no pyramid, one is then built in memory
         """
         self.clearImage()
         if image_file is not None:
-            with h5py.File(image_file, "r") as image_data:
-                x_bound = image_data[original_image_key].shape[1]
-                y_bound = image_data[original_image_key].shape[0]
-
-            self.scene.setSceneRect(0 - (self.scene_buffer), 
-                                    0 - (self.scene_buffer), 
-                                    x_bound + (self.scene_buffer), 
-                                    y_bound + (self.scene_buffer))
-
-            self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
-
             self.base_image_item = BaseImageGraphicsItem(
                 image_file, 
                 original_image_key, 
@@ -242,6 +339,17 @@ class ViewWidget(QGraphicsView):
                 highlight, 
                 no_pyramid
             )
+
+            # The item already read the image shape, no need to open the file again
+            x_bound = self.base_image_item.original_image_length
+            y_bound = self.base_image_item.original_image_height
+
+            self.scene.setSceneRect(0 - (self.scene_buffer), 
+                                    0 - (self.scene_buffer), 
+                                    x_bound + (self.scene_buffer), 
+                                    y_bound + (self.scene_buffer))
+
+            self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
             
             self.base_image_item.setPos(0, 0)
 
@@ -256,6 +364,8 @@ class ViewWidget(QGraphicsView):
             self.base_image_item.update_image_window(new_coordinates=bounds, 
                                                      new_zoom_level=self.current_zoom_level,
                                                      zoom_factor=self.zoom_factor)
+            # From now on, keep the view responsive while the image is rendered
+            self.base_image_item.render_in_background = True
             
             # Create "grid" item for polygons
             self.base_grid = BaseGrid(x_bound, y_bound)
@@ -281,32 +391,62 @@ class ViewWidget(QGraphicsView):
             tuples of (x, y) pixel locations of item vertices.
         """
         
-        for item in label_items:
-            if item['label_item_type'].lower() == 'polygon':
-                self.addPolygon(pts=item['label_item_vertices'], 
-                                uuid=item['label_item_uuid'])
+        # Add all of the items without invalidating the scene for each, then invalidate it once
+        self._batch_mode = True
+        try:
+            for item in label_items:
+                if item['label_item_type'].lower() == 'polygon':
+                    self.addPolygon(pts=item['label_item_vertices'], 
+                                    uuid=item['label_item_uuid'])
+        finally:
+            self._batch_mode = False
+        self.scene.update(self.scene.sceneRect())
 
         # Set view center to the first item on the list
-        self.centerOn(self.label_items[0])
+        if self.label_items:
+            self.centerOn(self.label_items[0])
+    
+    
+    def getLabelItemsSoA(self,
+                         get_label_item_pixels: bool = False,
+                         get_label_item_brect: bool = False):
+        """Collect the info from the label items as one list per
+        field, in label item order.
+        
+        Returns
+        -------
+        dict
+            With the keys 'types', 'vertices' and 'uuids', plus
+            'pixels' and 'bounding_rects' which are None unless
+            requested.
+        """
+        label_items = self.label_items
+        return {'types': [item.item_type for item in label_items],
+                'vertices': [item.getVertices() for item in label_items],
+                'uuids': [item.getUUID() for item in label_items],
+                'pixels': ([item.getCoveredPixels() for item in label_items]
+                           if get_label_item_pixels else None),
+                'bounding_rects': ([item.getBoundingRect() for item in label_items]
+                                   if get_label_item_brect else None)}
     
     
     def getLabelItems(self,
                         get_label_item_pixels: bool = False,
                         get_label_item_brect: bool = False):
         """Public function to collect the info from the overlay 
-        items.
+        items, as one dict per item.
         """
-        items = []
-        for item in self.label_items:
-            it_dict = {'label_item_type': item.item_type,
-                       'label_item_vertices': item.getVertices(),
-                       'label_item_uuid': item.getUUID()}
-            
-            if get_label_item_pixels:
-                it_dict['label_item_pixels'] = item.getCoveredPixels()
-            if get_label_item_brect:
-                it_dict['label_item_bounding_rect'] = item.getBoundingRect()
-            items.append(it_dict)
+        soa = self.getLabelItemsSoA(get_label_item_pixels, get_label_item_brect)
+        items = [{'label_item_type': item_type,
+                  'label_item_vertices': vertices,
+                  'label_item_uuid': uuid}
+                 for item_type, vertices, uuid in zip(soa['types'], soa['vertices'], soa['uuids'])]
+        if get_label_item_pixels:
+            for it_dict, pixels in zip(items, soa['pixels']):
+                it_dict['label_item_pixels'] = pixels
+        if get_label_item_brect:
+            for it_dict, brect in zip(items, soa['bounding_rects']):
+                it_dict['label_item_bounding_rect'] = brect
         return items
 
 
@@ -314,11 +454,7 @@ class ViewWidget(QGraphicsView):
         """Public function to get the list of covered pixels for
         every overlay item in the scene.
         """
-        items = []
-        for item in self.label_items:
-            items.append({'label_item_pixels': item.getCoveredPixels()})
-
-        return items
+        return [{'label_item_pixels': item.getCoveredPixels()} for item in self.label_items]
     
     
     #def addOverlayItem(self, overlay_item: dict, index=None):
@@ -359,8 +495,10 @@ class ViewWidget(QGraphicsView):
         else:
             self.label_items.insert(index, label_item)
             self.label_items[index].setParentItem(self.base_grid)
+        self._invalidateItemIndices()
         
-        self.scene.update(self.scene.sceneRect())
+        # Only the area under the new item needs to be redrawn
+        self.scene.update(label_item.sceneBoundingRect())
         
     
     def clearImage(self):
@@ -370,10 +508,13 @@ class ViewWidget(QGraphicsView):
         # unnecessary to clear items as removing the
         # base image item will clear all children items.
         if self.base_image_item is not None:
+            self.update_timer.stop()
+            self.base_image_item.close()
             self.clearLabelItems()
             self.scene.removeItem(self.base_image_item)
             self.scene.update(self.scene.sceneRect())
             self.base_image_item = None
+            self._chip_buf = None
     
     
     def clearLabelItems(self):
@@ -381,12 +522,12 @@ class ViewWidget(QGraphicsView):
         """
         if (self.label_items is not None and
             self.label_items != []):
-            for _ in range(len(self.label_items)):
-                it = self.removeItem(0)
-                del(it)
-                #item.setParentItem(None)
-                #self.scene.update(self.scene.sceneRect())
+            # Remove everything from the scene, then drop the whole list,
+            # rather than popping items off the front one at a time
+            for it in self.label_items:
+                self.scene.removeItem(it)
             self.label_items = []
+            self._invalidateItemIndices()
     
     def addPolygon(self, pts=None, uuid=None, index=None, poly: QPolygonF=None):
         """Add a polygon to the scene.
@@ -402,14 +543,12 @@ class ViewWidget(QGraphicsView):
                             self.mapToScene(viewport.topLeft()).y())
                 view_width = (self.mapToScene(viewport.topRight()).x() - 
                             self.mapToScene(viewport.topLeft()).x())
-                pts = [QPointF(view_center.x(), view_center.y()),
-                    QPointF(view_center.x(), view_center.y()+(view_height/5.0)),
-                    QPointF(view_center.x()+(view_width/5.0), view_center.y())]
-            else:
-                pts = [QPointF(pt[0], pt[1]) for pt in pts]
+                pts = [(view_center.x(), view_center.y()),
+                       (view_center.x(), view_center.y()+(view_height/5.0)),
+                       (view_center.x()+(view_width/5.0), view_center.y())]
             
             # Set up the new polygon
-            poly = QPolygonF(pts)
+            poly = polygon_from_points(pts)
         
         if index is None:
             self.label_items.append(InteractivePolygon(poly, self.base_grid))
@@ -417,12 +556,13 @@ class ViewWidget(QGraphicsView):
         
         else:
             self.label_items.insert(index, InteractivePolygon(poly, self.base_grid))
+        self._invalidateItemIndices()
         self.label_items[index].setUUID(uuid)
         
         # Apply the style options to the new polygon
         self.label_items[index].setLineWidth(self.label_item_line_width)
         self.label_items[index].setVertexDiameter(
-            self.label_item_vertex_diameter * (self.zoom_factor ** (self.current_zoom_level + 1))
+            self.label_item_vertex_diameter * self._getVertexDiameterScale(self.current_zoom_level)
         )
         self.label_items[index].setLineColor(self.label_item_line_color)
         self.label_items[index].setVertexColor(self.label_item_vertex_color)
@@ -434,8 +574,9 @@ class ViewWidget(QGraphicsView):
         # drawn item will be on top.
         self.label_items[index].setZValue(1.0)
         
-        # Schedule redraw of area of scene
-        self.scene.update(self.scene.sceneRect())
+        # Schedule redraw of the area of the scene under the new polygon
+        if not self._batch_mode:
+            self.scene.update(self.label_items[index].sceneBoundingRect())
     
     def removeItem(self, index: int):
         """Removes an item from the scene and returns it.
@@ -457,6 +598,7 @@ class ViewWidget(QGraphicsView):
         function.
         """
         del_item = self.label_items.pop(index)
+        self._invalidateItemIndices()
         self.scene.removeItem(del_item)
         return (del_item)
 
@@ -508,9 +650,7 @@ class ViewWidget(QGraphicsView):
             inputs are None.
         """
         # See if there's a specific vertices key to look for:
-        ovk = None
-        if 'overlay_item_vertices_key' in kwargs.keys():
-            ovk = kwargs['overlay_item_vertices_key']
+        ovk = kwargs.get('overlay_item_vertices_key')
         
         # Don't crash if required key is missing; just return
         if (vertices is None and
@@ -539,6 +679,11 @@ class ViewWidget(QGraphicsView):
         if line_width is None:
             line_width = self.label_item_line_width
         
+        # Group the segments so the whole overlay item can be shown or
+        # hidden at once
+        group = QGraphicsItemGroup(self.base_grid)
+        # setPen copies the pen, so one instance serves every segment
+        pen = QPen(QColor(*color), line_width, qstyle, Qt.RoundCap, Qt.RoundJoin)
         i = 1
         overlay_item = []
         while i < len(vertices):
@@ -546,14 +691,11 @@ class ViewWidget(QGraphicsView):
                                                   vertices[i-1][1],
                                                   vertices[i][0],
                                                   vertices[i][1],
-                                                  self.base_grid))
-            overlay_item[-1].setPen(QPen(QColor(*color),
-                                         line_width,
-                                         qstyle,
-                                         Qt.RoundCap,
-                                         Qt.RoundJoin))
+                                                  group))
+            overlay_item[-1].setPen(pen)
             i += 1
         self.overlay_items.append(overlay_item)
+        self.overlay_item_groups.append(group)
         #self.scene.update(self.scene.sceneRect())
         
         return 0
@@ -579,8 +721,13 @@ class ViewWidget(QGraphicsView):
         function.
         """
         del_items = self.overlay_items.pop(index)
+        # Removing the group removes its segments from the scene along
+        # with it.  The segments are then detached so they outlive the group.
+        group = self.overlay_item_groups.pop(index)
+        if group.scene() is not None:
+            group.scene().removeItem(group)
         for del_item in del_items:
-            self.scene.removeItem(del_item)
+            del_item.setParentItem(None)
         return (del_items)
     
     
@@ -589,36 +736,30 @@ class ViewWidget(QGraphicsView):
         """
         if (self.overlay_items is not None and
             self.overlay_items != []):
-            for i in range(len(self.overlay_items)):
-                it = self.removeOverlayItem(0)
-                del(it)
-                #item.setParentItem(None)
-                #self.scene.update(self.scene.sceneRect())
+            for group in self.overlay_item_groups:
+                if group.scene() is not None:
+                    group.scene().removeItem(group)
             self.overlay_items = []
+            self.overlay_item_groups = []
 
 
     def showOverlay(self, showbool: bool):
         """Show or hide the overlay.
         """
-        if showbool:
-            for overlay_item in self.overlay_items:
-                for segment in overlay_item:
-                    segment.show()
-        else:
-            for overlay_item in self.overlay_items:
-                for segment in overlay_item:
-                    segment.hide()
+        for group in self.overlay_item_groups:
+            group.setVisible(showbool)
 
     
     def update_vertex_diameters(self, zoom_level):
         """
         When zooming in/out, update the dimater of the polygon vertices to make them easier to grab.
         """
+        new_diameter = self.label_item_vertex_diameter * self._getVertexDiameterScale(zoom_level)
+
+        # setVertexDiameter doesn't schedule a redraw, so invalidate the scene once for all items
         for label_item in self.label_items:
-            new_diameter = self.label_item_vertex_diameter * (self.zoom_factor ** (zoom_level + 1))
             label_item.setVertexDiameter(new_diameter)
-
-        self.scene.update(self.scene.sceneRect())
+        self.scene.update()
         
         
     ##########################################################
@@ -627,9 +768,8 @@ class ViewWidget(QGraphicsView):
     def labelItemSelected(self):
         """ NOT USED """
         print("ITEM SELECTED")
-        for i in range(len(self.label_items)):
-            if self.label_items[i].isSelected():
-                print ("ITEM {} IS SELECTED.".format(i))
+        for i in self._selectedLabelItemIndices():
+            print ("ITEM {} IS SELECTED.".format(i))
        
     def onOpenImage(self, raw_image):
         """ NOT USED """
@@ -642,8 +782,8 @@ class ViewWidget(QGraphicsView):
     def clearLabelItemSelection(self):
         """Clears the selection overlay item.
         """
-        for it in self.label_items:
-            it.setSelected(False)
+        for i in list(self._selectedLabelItemIndices()):
+            self.label_items[i].setSelected(False)
 
     def setLabelItemSelected(self, index):
         """Sets the overlay item at index as selected
@@ -677,11 +817,7 @@ class ViewWidget(QGraphicsView):
         self.setPolyAssistMethod(self.poly_assist_configs['method'])
         
         # Get active polygon id
-        touseid = None
-        for i in range(len(self.label_items)):
-            if self.label_items[i].isSelected():
-                touseid = i
-                break
+        touseid = next(iter(self._selectedLabelItemIndices()), None)
                 
         if touseid is not None:    
             # taking viewport and mapping to scene coordinates, then get bound rectangle
@@ -691,22 +827,28 @@ class ViewWidget(QGraphicsView):
             coordinates_in_baseGrid = self.base_grid.mapRectFromScene(coordinates_in_scene_coord)
             
             # Get image chip associated with baseGrid (full resolution) based on user's current viewport
-            img_chip = self.base_image_item.get_image_chip(coordinates_in_baseGrid)
+            img_chip = self.base_image_item.get_image_chip(coordinates_in_baseGrid, out=self._chip_buf)
+            self._chip_buf = img_chip
             
-            # Scene coordinates of item to grid coordinates          
-            vertices_in_scene_coord = self.label_items[touseid].getVertices()
-            vertices_in_grid_coord: list[QPointF] = [self.base_grid.mapFromScene(pt[0],pt[1]) for pt in vertices_in_scene_coord]
+            # Scene coordinates of item to grid coordinates, mapping the whole polygon at once
+            vertices_in_scene_coord = polygon_from_points(self.label_items[touseid].getVertices())
+            vertices_in_grid_coord = points_from_polygon(self.base_grid.mapFromScene(vertices_in_scene_coord))
             
-            # Get top left point of chip in scene coordinates
-            chip_top = int(coordinates_in_baseGrid.top())
-            chip_left = int(coordinates_in_baseGrid.left())
+            # Get top left point of chip in grid coordinates. The chip is clipped to the
+            # image, so it starts at 0 when the viewport reaches into the scene margin.
+            chip_top = min(max(int(coordinates_in_baseGrid.top()), 0), 
+                           self.base_image_item.original_image_height)
+            chip_left = min(max(int(coordinates_in_baseGrid.left()), 0), 
+                            self.base_image_item.original_image_length)
+            chip_origin = np.array([chip_left, chip_top], dtype=np.float64)
             
-            # calculated vertices of polygon in chip based on chip coordinate
-            poly_vertices_in_chip = [(pt.x()-chip_left,pt.y()-chip_top) for pt in vertices_in_grid_coord]
+            # calculated vertices of polygon in chip based on chip coordinate, as an (N, 2) array
+            poly_vertices_in_chip = vertices_in_grid_coord - chip_origin
             
-            logging.info(self.poly_assist_configs['method'])
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("%s", self.poly_assist_configs['method'])
             
-            # Not assuming algorithms no what QT objects are, let's just pass a list of the vertices.
+            # Not assuming algorithms no what QT objects are, let's just pass an array of the vertices.
             #input_pts=poly_vertices_in_chip.getVertices()
             newPolyVerts = poly_assistant.refine_polygon(img_chip,
                                                          poly_vertices_in_chip,
@@ -714,7 +856,14 @@ class ViewWidget(QGraphicsView):
             
             # Work backwards to SCENE coordinates
             # calculated vertices of polygon in chip based on chip coordinate
-            new_poly_vertices_in_scene_coords = [self.base_grid.mapToScene(pt[0] + chip_left, pt[1] + chip_top) for pt in newPolyVerts]
+            new_poly_vertices_in_grid_coords = np.asarray(newPolyVerts, dtype=np.float64) + chip_origin
+            
+            # Apply the grid to scene transform to all of the vertices at once
+            T = self.base_grid.sceneTransform()
+            grid_to_scene = np.array([[T.m11(), T.m12()],
+                                      [T.m21(), T.m22()]])
+            new_poly_vertices_in_scene_coords = (new_poly_vertices_in_grid_coords @ grid_to_scene
+                                                 + np.array([T.dx(), T.dy()]))
             
             # Remove old polygon from list and memory
             # NOTE: in future, if we want to preserve the original polygon (in case the user doesn't like the new one),
@@ -723,7 +872,7 @@ class ViewWidget(QGraphicsView):
             del old_polygon
 
             # Add new polygon object
-            self.addPolygon(poly=QPolygonF(new_poly_vertices_in_scene_coords), index = touseid)
+            self.addPolygon(poly=polygon_from_points(new_poly_vertices_in_scene_coords), index = touseid)
         
     def setPolyAssistMethod(self, method):
         self.poly_assist_configs['method'] = method
@@ -743,41 +892,40 @@ class ViewWidget(QGraphicsView):
         and overlay item movements.
         """
         selected_flag = False
-        for i in range(len(self.label_items)):
-            if self.label_items[i].isSelected():
-                selected_flag = True
-                if i != self.previous_item_selected:
-                    self.previous_item_selected = i
-                    self.label_item_selection_changed.emit(i)
-                
-                # If the handle was moved, add the move to the 
-                # undo stack
-                if self.label_items[i].handle_moved_flag:
-                    cmd = commandMoveHandle(self.label_items[i],
-                                            self.label_items[i].handle_selected,
-                                            self.label_items[i].mouse_press_pos,
-                                            self.label_items[i].mouse_move_pos)
-                    self.command_added.emit(cmd)
-                # If a handle was added, add the addition to the 
-                # undo stack
-                elif self.label_items[i].insert_handle_flag:
-                    cmd = commandInsertHandle(self.label_items[i],
-                                              self.label_items[i].mouse_press_pos)
-                    self.command_added.emit(cmd)
-                # If a handle was deleted, add the deletion to the
-                # undo stack
-                elif self.label_items[i].delete_handle_flag:
-                    if (self.label_items[i].handle_selected is not None and
-                        len(self.label_items[i].handles) > 3):
-                        cmd = commandDeleteHandle(self.label_items[i],
-                                                  self.label_items[i].handle_selected)
-                        self.command_added.emit(cmd)
-
-                # If the item was moved, add the movement to the undo stack
-                elif self.label_items[i].item_moved_flag:
-                    cmd = commandMoveItem(self.label_items[i],
-                                          self.label_items[i].item_press_pos)
+        for i in self._selectedLabelItemIndices():
+            selected_flag = True
+            if i != self.previous_item_selected:
+                self.previous_item_selected = i
+                self.label_item_selection_changed.emit(i)
+            
+            # If the handle was moved, add the move to the 
+            # undo stack
+            if self.label_items[i].handle_moved_flag:
+                cmd = commandMoveHandle(self.label_items[i],
+                                        self.label_items[i].handle_selected,
+                                        self.label_items[i].mouse_press_pos,
+                                        self.label_items[i].mouse_move_pos)
+                self.command_added.emit(cmd)
+            # If a handle was added, add the addition to the 
+            # undo stack
+            elif self.label_items[i].insert_handle_flag:
+                cmd = commandInsertHandle(self.label_items[i],
+                                          self.label_items[i].mouse_press_pos)
+                self.command_added.emit(cmd)
+            # If a handle was deleted, add the deletion to the
+            # undo stack
+            elif self.label_items[i].delete_handle_flag:
+                if (self.label_items[i].handle_selected is not None and
+                    len(self.label_items[i].handles) > 3):
+                    cmd = commandDeleteHandle(self.label_items[i],
+                                              self.label_items[i].handle_selected)
                     self.command_added.emit(cmd)
+
+            # If the item was moved, add the movement to the undo stack
+            elif self.label_items[i].item_moved_flag:
+                cmd = commandMoveItem(self.label_items[i],
+                                      self.label_items[i].item_press_pos)
+                self.command_added.emit(cmd)
         
         if not selected_flag:
             if self.previous_item_selected is not None:
@@ -785,9 +933,8 @@ class ViewWidget(QGraphicsView):
                 self.label_item_selection_changed.emit(-1)
 
         # Update image based on new window
-        bounds = self.mapToScene(self.viewport().geometry()).boundingRect()
         if self.base_image_item is not None:
-            self.base_image_item.update_image_window(new_coordinates=bounds)
+            self.update_timer.start()
         
         super().mouseReleaseEvent(mouseEvent)
     
@@ -796,11 +943,7 @@ class ViewWidget(QGraphicsView):
         deletions.
         """
         if keyEvent.key() == Qt.Key_Delete:
-            del_ind = -1
-            for i in range(len(self.label_items)):
-                if self.label_items[i].isSelected():
-                    del_ind = i
-                    break
+            del_ind = next(iter(self._selectedLabelItemIndices()), -1)
             if del_ind != -1:
                 self.delete_item_request.emit(del_ind)
         
@@ -811,9 +954,8 @@ class ViewWidget(QGraphicsView):
             keyEvent.key() == Qt.Key_Left or \
             keyEvent.key() == Qt.Key_Right:
             # Update image based on new window
-            bounds = self.mapToScene(self.viewport().geometry()).boundingRect()
             if self.base_image_item is not None:
-                self.base_image_item.update_image_window(new_coordinates=bounds)
+                self.update_timer.start()
             
         
     ##########################################################
@@ -822,10 +964,17 @@ class ViewWidget(QGraphicsView):
     def _onCommandAdded(self, cmd: QUndoCommand):
         self.command_added.emit(cmd)
 
+    def _onSelectionChanged(self):
+        self._selected_indices = None
+
     def _onSliderReleased(self):
         # Update image based on new window
-        bounds = self.mapToScene(self.viewport().geometry()).boundingRect()
-        self.base_image_item.update_image_window(new_coordinates=bounds)
+        self.update_timer.start()
+
+    def _onUpdateImageWindow(self):
+        if self.base_image_item is not None:
+            bounds = self.mapToScene(self.viewport().geometry()).boundingRect()
+            self.base_image_item.update_image_window(new_coordinates=bounds)
 
 class BaseImageGraphicsItem(QGraphicsItem):
     """Base class for the image graphics item.
@@ -863,17 +1012,33 @@ class BaseImageGraphicsItem(QGraphicsItem):
     current_crop_list: dict[(int,int) -> numpy.array]
         Dictionary of tile indexes -> crops. Essentially, the tile cache. 
         Tiles are added and removed as the user navigates the image.
+    tile_extremes: dict[(int,int) -> (float,float)]
+        Dictionary of tile indexes -> (min, max) of the tiles in current_crop_list.
+    current_crop_extremes: (float,float) | None
+        The (min, max) of the current crop, before image levels are applied.
     current_coordinates: QRectF
         Coordinates representing the position of the viewport in the scene.
     current_zoom_level: int
         Current zoom level of the image. Initialized at the max zoom.
     current_crop: np.array
         Current crop of image, based on coordinates and zoom level.
+    raw_crop: np.array | None
+        The tiles of current_crop_list stitched together, before image levels are
+        applied. Kept so that changing the image levels doesn't stitch them again.
     processing_tile_size: int
         Size (length and width) of the tiles used for processing/dynamic loading.
     display_tile_size: int
         Size (length and width) of the tiles used for display. Only necessary when 
         viewing large images without dynamic loading.
+    prefetched_tiles: dict[(str,int,int) -> numpy.array]
+        Tiles bordering the current crop, read ahead in the background. Keyed by
+        pyramid level name and tile index.
+    no_pyramid: bool
+        Whether the image file has no pyramid. If so, the pyramid levels are 
+        decimated from the original image into memory when the file is opened.
+    render_in_background: bool
+        Whether crops are rendered in a background thread, and displayed when
+        done. The newest request supersedes any pending one. False by default.
     """
 
     error_signal = pyqtSignal(str)
@@ -901,67 +1066,188 @@ class BaseImageGraphicsItem(QGraphicsItem):
         self.current_mid = self.original_mid
         self.current_highlight = self.original_highlight
 
-        # Add image pointer as class member
+        # Add image pointer as class member, and open the file
+        self.no_pyramid = no_pyramid
+        self._h5 = None
         self.set_image_file(image_file)
 
         # Get image metadata
-        with h5py.File(self.image_file, "r") as image_data:
-            self.max_zoom = image_data.attrs["max_level"]
-            self.original_image_length = image_data.get(self.original_image_key).shape[1]
-            self.original_image_height = image_data.get(self.original_image_key).shape[0]
+        self.max_zoom = self._h5.attrs["max_level"]
+        if len(self._runtime_pyramid) != 0:
+            self.max_zoom = max(self._runtime_pyramid)
+        self.original_image_length = self._level_shapes[-1][1]
+        self.original_image_height = self._level_shapes[-1][0]
+        # The image size is fixed, so boundingRect() returns this one rect
+        self._bounding_rect = QRectF(0, 0, self.original_image_length,
+                                     self.original_image_height)
+
+        # Coordinates of the last update of the image window
+        self.current_coordinates = None
 
         # Initialize tile list
         self.current_crop_list = {}
+        self.raw_crop = None
+        self.tile_extremes = {}
+        self.current_crop_extremes = None
+        self.current_crop = None
+        self.paint_x_coord = 0
+        self.paint_y_coord = 0
+        self.num_tiles_h = 0
+        self.num_tiles_w = 0
 
         # Set current zoom level based on resolution
         self.current_zoom_level = self.get_max_zoom()
 
-        # Set tile size if pyramid is being used. Otherwise, the entire image is one tile.
-        if no_pyramid:
-            max_dim = max(self.original_image_length, self.original_image_height)
-            self.processing_tile_size = max_dim + (int(max_dim * 0.1))# add a buffer to be safe
-        else:
-            self.processing_tile_size = 512
+        # Images without a pyramid are tiled the same way, using the runtime pyramid
+        self.processing_tile_size = 512
+        self._check_pyramid_chunks()
 
         self.display_tile_size = 20000
+
+        # Background reads of the tiles bordering the viewport. The tiles are sent
+        # back to the UI thread, which is the only one to touch prefetched_tiles.
+        self.prefetched_tiles = {}
+        self._prefetch_generation = 0
+        self._prefetch_pool = QThreadPool()
+        self._prefetch_pool.setMaxThreadCount(1)
+        self._prefetch_signals = TilePrefetcherSignals()
+        self._prefetch_signals.prefetched.connect(self._onTilePrefetched)
+        # Arguments of _prefetch_neighbor_tiles() for the tiles around the last
+        # crop, set by the rendering and scheduled on the UI thread
+        self._prefetch_request = None
+
+        # 8-bit lookup table of the current image levels, for integer images
+        self._levels_lut = None
+        self._levels_lut_key = None
+
+        # Pixmaps being painted, as a flat list of (x, y, pixmap). Only set on the
+        # UI thread.
+        self._display = []
+
+        # Crop rendering, optionally in the background. A background render 
+        # works on a CropRenderState copied from the item, which is applied
+        # back to the item on the UI thread.
+        self.render_in_background = False
+        self._render_generation = 0
+        self._render_pool = QThreadPool()
+        self._render_pool.setMaxThreadCount(1)
+        self._render_signals = CropRendererSignals()
+        self._render_signals.rendered.connect(self._onCropRendered)
+        # (pyramid level name, inverse scales) that the tiles in current_crop_list were read at
+        self._tile_cache_key = None
     
     ##########################################################
     # PUBLIC
     ##########################################################
-    def get_image_chip(self, coordinates: QRectF = None):
-    
-        with h5py.File(self.image_file, "r") as image_data:
-            # TODO: Use this logic to get correct zoom level (pyramid level) for desired resolution of image chip
-            """
-            # Zoom < 0, use original image
-            if new_zoom_level <= 0:
-                pyramid_level = image_data[self.original_image_key]
-            # Zoom > max, use max image
-            elif new_zoom_level > self.get_max_zoom():
-                # If zooming out, but only one zoom level exists, use original
-                if self.get_max_zoom() == 0:
-                    pyramid_level = image_data[self.original_image_key]
-                else:
-                    pyramid_level = image_data["pyramid"][str(self.get_max_zoom())]
+    def get_image_chip(self, coordinates: QRectF = None, out: np.ndarray = None):
+        """
+        Read the full resolution image inside of coordinates.
+
+        The chip is read with Dataset.read_direct, straight into out if it has
+        exactly the chip's shape and type, otherwise into a newly allocated array.
+
+        Parameters
+        ----------
+        coordinates: QRectF
+            The chip coordinates, in item coordinates. Clipped to the image bounds.
+        out: np.ndarray | None
+            Optional C-contiguous array to read the chip into.
+
+        Returns
+        -------
+        np.array
+            The C-contiguous chip, which is out if it was used.
+        """
+        # TODO: Use this logic to get correct zoom level (pyramid level) for desired resolution of image chip
+        """
+        # Zoom < 0, use original image
+        if new_zoom_level <= 0:
+            pyramid_level = self._pyramid_levels[-1]
+        # Zoom > max, use max image
+        elif new_zoom_level > self.get_max_zoom():
+            # If zooming out, but only one zoom level exists, use original
+            if self.get_max_zoom() == 0:
+                pyramid_level = self._pyramid_levels[-1]
             else:
-                pyramid_level = image_data["pyramid"][str(new_zoom_level)]
-
-            """
-            # This is our unzoomed image
-            pyramid_level = image_data[self.original_image_key]
-              
-            # 
-            window_crop = pyramid_level[int(coordinates.top()) : int(coordinates.bottom()),
-                                        int(coordinates.left()) : int(coordinates.right())]  
-            
-            return window_crop
+                pyramid_level = self._pyramid_levels[self.get_max_zoom()]
+        else:
+            pyramid_level = self._pyramid_levels[new_zoom_level]
+
+        """
+        # This is our unzoomed image
+        pyramid_level = self._pyramid_levels[-1]
+
+        level_shape = self._level_shapes[-1]
+        top = min(max(int(coordinates.top()), 0), level_shape[0])
+        bottom = min(max(int(coordinates.bottom()), top), level_shape[0])
+        left = min(max(int(coordinates.left()), 0), level_shape[1])
+        right = min(max(int(coordinates.right()), left), level_shape[1])
+        height = bottom - top
+        width = right - left
+
+        # Only allocate when the given array doesn't match the chip
+        shape = (height, width) + level_shape[2:]
+        if (out is None or
+            out.dtype != pyramid_level.dtype or
+            out.shape != shape or
+            not out.flags.c_contiguous):
+            out = np.empty(shape, dtype=pyramid_level.dtype)
+
+        if height > 0 and width > 0:
+            pyramid_level.read_direct(out, np.s_[top:bottom, left:right])
+
+        return out
 
     def set_image_file(self, image_file):
         """
-        Set raw image, or the object representing the image on disc (not yet in memory)
+        Set raw image, or the object representing the image on disc (not yet in memory).
+
+        The file is opened once here and kept open, along with the datasets of the
+        original image and each pyramid level, until close() is called.
         """
+        self.close()
         self.image_file = image_file
 
+        self._h5 = h5py.File(self.image_file, "r",
+                             rdcc_nbytes=H5_CHUNK_CACHE_BYTES,
+                             rdcc_nslots=H5_CHUNK_CACHE_SLOTS,
+                             rdcc_w0=0.75)
+        # Pyramid level -> dataset, with the original image at -1
+        self._pyramid_levels = {-1: self._h5[self.original_image_key]}
+        if "pyramid" in self._h5:
+            for key, dataset in self._h5["pyramid"].items():
+                self._pyramid_levels[int(key)] = dataset
+        self._runtime_pyramid = {}
+        if self.no_pyramid and "pyramid" not in self._h5:
+            self._runtime_pyramid = self._build_runtime_pyramid(self._pyramid_levels[-1])
+            self._pyramid_levels.update(self._runtime_pyramid)
+        self._level_shapes = {level: dataset.shape for level, dataset in self._pyramid_levels.items()}
+        # Names of the chunked levels stored without filters, whose chunks can be read as is,
+        # if h5py can read them into the tiles
+        self._raw_chunk_levels = set()
+        if H5_READ_CHUNKS_INTO_BUFFER:
+            self._raw_chunk_levels = {dataset.name for dataset in self._pyramid_levels.values()
+                                      if isinstance(dataset, h5py.Dataset) and dataset.chunks is not None 
+                                      and dataset.id.get_create_plist().get_nfilters() == 0}
+
+        # Rendered crops of recently visited views, least recently used first.
+        # When the current crop comes from there, the tile cache doesn't match it.
+        self._rendered_cache = OrderedDict()
+        self._crop_from_render_cache = False
+        # Pixmaps of the display tiles shown most recently, by id of the tiles: 
+        # (tiles, pixmaps). Only used on the UI thread.
+        self._pixmap_cache = OrderedDict()
+
+    def close(self):
+        """
+        Close the image file, if it is open.
+        """
+        if self._h5 is not None:
+            self.stop_render()
+            self.stop_prefetch()
+            self._h5.close()
+            self._h5 = None
+
 
     def update_image_window(self, 
                     new_coordinates: QRectF = None, 
@@ -981,6 +1267,9 @@ class BaseImageGraphicsItem(QGraphicsItem):
         and zooming out of the highest level (above the max zoom), no scaling occurs 
         because resolution isn't changing.
 
+        If render_in_background is set, the crop is rendered in a background thread
+        and displayed once done, unless a newer update was requested meanwhile.
+
         Parameters
         ----------
         new_coordinates: QRectF
@@ -1003,6 +1292,13 @@ class BaseImageGraphicsItem(QGraphicsItem):
         -------
         None if the crop was not possible. Otherwise, updates image window.
         """
+        # Nothing to do if the viewport didn't move and nothing else changed,
+        # e.g. on a mouse release after a click
+        if (new_coordinates is not None and self._same_coordinates(new_coordinates) and
+            new_zoom_level is None and new_shadow is None and new_mid is None and 
+            new_highlight is None and not autoset_levels):
+            return
+
         # Check if new coordinates
         if new_coordinates:
             self.current_coordinates = new_coordinates
@@ -1010,6 +1306,7 @@ class BaseImageGraphicsItem(QGraphicsItem):
             new_coordinates = self.current_coordinates
 
         # Check if new zoom level
+        scale_changed = False
         if new_zoom_level != None:
             # Only scale if the zoom is within the range of the pyramid
             # Also, never scale if there is only one zoom level(0)
@@ -1017,16 +1314,14 @@ class BaseImageGraphicsItem(QGraphicsItem):
                 self.prepareGeometryChange()
                 # Scale the item coordinate system to match the scene
                 scale_factor = zoom_factor ** float(abs(new_zoom_level)) if new_zoom_level != 0 else 1
+                scale_changed = scale_factor != self.scale()
                 self.setScale(scale_factor)
-                
-                # Throw away all of our cached tiles, because we need to load a different resolution
-                self.current_crop_list = {}
 
             self.current_zoom_level = new_zoom_level
         else:
             new_zoom_level = self.current_zoom_level
 
-        # Check if new zoom levels
+        # Check if new image levels
         if not autoset_levels:
             if not new_shadow:
                 new_shadow = self.current_shadow
@@ -1035,25 +1330,39 @@ class BaseImageGraphicsItem(QGraphicsItem):
             if not new_highlight:
                 new_highlight = self.current_highlight
 
-        crop = self._calculate_crop(new_coordinates=new_coordinates, 
-                                   new_zoom_level=new_zoom_level,
-                                   shadow=new_shadow,
-                                   mid=new_mid,
-                                   highlight=new_highlight,
-                                   autoset_levels=autoset_levels)
+        # Any render still pending is superseded by this one
+        self._render_generation += 1
+        self._render_pool.clear()
 
-        if crop is not None: 
-            self.current_crop = crop
-
-            display_tiles = self._make_display_tiles(crop)
-            # Set the tiles to view
-            self._set_pixmaps(display_tiles)
-
-            self.update()
+        # If this view was rendered recently at the same levels, display it again as is
+        if not autoset_levels:
+            render_key = self._render_key(new_coordinates, new_zoom_level, 
+                                          new_shadow, new_mid, new_highlight)
+            if render_key in self._rendered_cache:
+                self._rendered_cache.move_to_end(render_key)
+                rendered = self._rendered_cache[render_key]
+                self.current_crop = rendered[0]
+                self.current_shadow = new_shadow
+                self.current_mid = new_mid
+                self.current_highlight = new_highlight
+                self._crop_from_render_cache = True
+                self._show_rendered(rendered)
+                return
+
+        # The rendering maps scene coordinates to the item with this copy of the
+        # transform, so it doesn't have to touch the item from another thread
+        scene_to_item, _ = self.sceneTransform().inverted()
+        render_args = (new_coordinates, new_zoom_level, new_shadow, new_mid, new_highlight,
+                       autoset_levels, scene_to_item)
+
+        # Automatic levels are rendered right away, because callers read them back.
+        # So are changes of scale, which would stretch the pixmaps being displayed.
+        if self.render_in_background and not autoset_levels and not scale_changed:
+            self._render_pool.start(CropRenderer(self, self._render_generation, 
+                                                 CropRenderState(self), render_args))
         else:
-            # If the crop isn't possible (outside of image coordinates), quit.
-            # Only really happens if you zoom into the margins.
-            return
+            rendered = self._render_crop(*render_args)
+            self._finish_render(new_coordinates, new_zoom_level, rendered)
 
 
     def autoSetImageLevelsInBounds(self):
@@ -1084,6 +1393,24 @@ class BaseImageGraphicsItem(QGraphicsItem):
                                 new_highlight=self.original_highlight)
 
 
+    def stop_prefetch(self):
+        """
+        Cancel any pending tile prefetch and wait for the running one to finish,
+        so the image file is no longer held open.
+        """
+        self._prefetch_generation += 1
+        self._prefetch_pool.clear()
+        self._prefetch_pool.waitForDone()
+        self.prefetched_tiles = {}
+
+    def stop_render(self):
+        """
+        Cancel any pending background render and wait for the running one to finish.
+        """
+        self._render_generation += 1
+        self._render_pool.clear()
+        self._render_pool.waitForDone()
+
     def get_max_zoom(self):
         return self.max_zoom
 
@@ -1094,13 +1421,207 @@ class BaseImageGraphicsItem(QGraphicsItem):
     # PRIVATE
     ##########################################################
 
+    def _check_pyramid_chunks(self):
+        """
+        Warn if the pyramid levels in the file are chunked so that reading a
+        processing tile decompresses data outside of it. Level z is scaled up by
+        2**z, so its tiles are processing_tile_size / 2**z of its pixels. Chunks
+        line up with the tiles when their sides divide the tile size, or cover a
+        whole small level.
+        """
+        misaligned = []
+        for level, dataset in self._pyramid_levels.items():
+            if level < 0 or not isinstance(dataset, h5py.Dataset) or dataset.chunks is None:
+                continue
+            tile_size = max(self.processing_tile_size // 2**level, 1)
+            for chunk, length in zip(dataset.chunks[:2], dataset.shape[:2]):
+                if tile_size % chunk != 0 and not chunk == length <= tile_size:
+                    misaligned.append(f"{level}: {dataset.chunks[:2]} for {tile_size} px tiles")
+                    break
+        if len(misaligned) != 0:
+            logger.warning("Pyramid chunks are not aligned to the tiles read from them (%s); "
+                           "regenerate the pyramid for faster reads.",
+                           ", ".join(misaligned))
+
+    def _same_coordinates(self, new_coordinates: QRectF, eps: float = 1e-6):
+        """
+        Whether the coordinates are those of the last update, give or take eps.
+        """
+        if self.current_coordinates is None:
+            return False
+        return all(abs(a - b) <= eps for a, b in zip(new_coordinates.getRect(),
+                                                      self.current_coordinates.getRect()))
+
+    def _tile_range(self, new_coordinates: QRectF):
+        """
+        Get the (x min, x max, y min, y max) scene indexes of the processing tiles
+        covering the coordinates.
+        """
+        return (max(int(new_coordinates.left()), 0) // self.processing_tile_size,
+                int(new_coordinates.right()) // self.processing_tile_size,
+                max(int(new_coordinates.top()), 0) // self.processing_tile_size,
+                int(new_coordinates.bottom()) // self.processing_tile_size)
+
+    def _build_runtime_pyramid(self, original: h5py.Dataset):
+        """
+        Decimate the original image into an in-memory pyramid, halving each level
+        until the coarsest fits in RUNTIME_PYRAMID_BYTES. The original is read once,
+        in bands of rows.
+
+        Returns
+        -------
+        levels: dict[int -> RuntimePyramidLevel]
+            Pyramid level -> level, empty if the original image is small enough.
+        """
+        height, width = original.shape[:2]
+        pixel_bytes = original.dtype.itemsize * int(np.prod(original.shape[2:]))
+        max_level = 0
+        while -(-height // 2**max_level) * -(-width // 2**max_level) * pixel_bytes > RUNTIME_PYRAMID_BYTES:
+            max_level += 1
+        if max_level == 0:
+            return {}
+
+        levels = {level: np.empty((-(-height // 2**level), -(-width // 2**level)) + original.shape[2:],
+                                  dtype=original.dtype)
+                  for level in range(1, max_level+1)}
+
+        # Bands start on multiples of every level's step, so rows line up across levels
+        band_height = 2**max_level * max(512 // 2**max_level, 1)
+        for top in range(0, height, band_height):
+            band = original[top:top+band_height]
+            for level, data in levels.items():
+                step = 2**level
+                decimated = band[::step, ::step]
+                data[top//step : top//step + decimated.shape[0]] = decimated
+
+        return {level: RuntimePyramidLevel(f"/runtime_pyramid/{level}", data) 
+                for level, data in levels.items()}
+
+    def _render_crop(self,
+                     new_coordinates: QRectF,
+                     new_zoom_level: int,
+                     new_shadow: Union[int, None],
+                     new_mid: Union[int, None],
+                     new_highlight: Union[int, None],
+                     autoset_levels: bool,
+                     scene_to_item: QTransform,
+                     state = None):
+        """
+        Render the crop of the given view and break it into display tiles.
+
+        The tile cache, current crop and levels are read from and updated in state,
+        the item itself by default. The rest of the item is only read, so a worker
+        thread can render into a CropRenderState.
+
+        Returns
+        -------
+        rendered: tuple | None
+            (crop, display tiles, paint x coordinate, paint y coordinate), or None 
+            if the view doesn't contain the image.
+        """
+        if state is None:
+            state = self
+
+        crop = self._calculate_crop(new_coordinates=new_coordinates, 
+                                   new_zoom_level=new_zoom_level,
+                                   shadow=new_shadow,
+                                   mid=new_mid,
+                                   highlight=new_highlight,
+                                   autoset_levels=autoset_levels,
+                                   scene_to_item=scene_to_item,
+                                   state=state)
+        if crop is None:
+            return None
+
+        state.current_crop = crop
+        return (crop, self._make_display_tiles(crop, state=state), 
+                state.paint_x_coord, state.paint_y_coord)
+
+    def _finish_render(self, new_coordinates: QRectF, new_zoom_level: int, rendered: tuple):
+        """
+        Once a crop is rendered into the item's state, read ahead the tiles around 
+        it, keep it in the rendered crop cache and display it. Must be called on 
+        the UI thread.
+        """
+        if self._prefetch_request is not None:
+            self._prefetch_neighbor_tiles(*self._prefetch_request)
+            self._prefetch_request = None
+
+        # If the crop isn't possible (outside of image coordinates), quit.
+        # Only really happens if you zoom into the margins.
+        if rendered is None:
+            return
+
+        render_key = self._render_key(new_coordinates, new_zoom_level, 
+                                      self.current_shadow, self.current_mid, self.current_highlight)
+        self._rendered_cache[render_key] = rendered
+        self._rendered_cache.move_to_end(render_key)
+        while len(self._rendered_cache) > RENDER_CACHE_SIZE:
+            self._rendered_cache.popitem(last=False)
+
+        self._show_rendered(rendered)
+
+    def _show_rendered(self, rendered: tuple):
+        """
+        Display a crop returned by _render_crop(). Must be called on the UI thread,
+        which pixmaps belong to.
+        """
+        _, display_tiles, paint_x_coord, paint_y_coord = rendered
+        # Only build pixmaps for display tiles that weren't shown recently. The 
+        # cache holds the tiles, so their ids aren't reused while they are in it.
+        key = id(display_tiles)
+        if key in self._pixmap_cache:
+            self._pixmap_cache.move_to_end(key)
+            self.pixmaps = self._pixmap_cache[key][1]
+        else:
+            self._set_pixmaps(display_tiles)
+            self._pixmap_cache[key] = (display_tiles, self.pixmaps)
+            while len(self._pixmap_cache) > RENDER_CACHE_SIZE:
+                self._pixmap_cache.popitem(last=False)
+        self._display = self._paint_entries(self.pixmaps, paint_x_coord, paint_y_coord)
+        self.update()
+
+    def _paint_entries(self, pixmaps, paint_x_coord, paint_y_coord):
+        """
+        Lay out the pixmap grid for paint(), as a flat list of (x, y, pixmap),
+        so the offsets are only computed when the displayed crop changes.
+        """
+        x_start = max(paint_x_coord, 0)
+        y_start = max(paint_y_coord, 0)
+        return [(x_start + (i*self.display_tile_size),
+                 y_start + (j*self.display_tile_size),
+                 pixmap)
+                for j, pixmap_row in enumerate(pixmaps)
+                for i, pixmap in enumerate(pixmap_row)]
+
+    def _onCropRendered(self, generation: int, render_args: tuple, state, rendered):
+        # Drop renders superseded by a newer request, along with their state
+        if generation == self._render_generation:
+            state.apply(self)
+            self._finish_render(render_args[0], render_args[1], rendered)
+
+    def _onTilePrefetched(self, generation: int, level_name: str, x: int, y: int, tile):
+        # Drop tiles of a superseded prefetch
+        if generation == self._prefetch_generation:
+            self.prefetched_tiles[(level_name, x, y)] = tile
+
+    def _render_key(self, new_coordinates, zoom_level, shadow, mid, highlight):
+        """
+        Key of the rendered crop cache: the rendering only depends on the
+        tiles covering the coordinates, and the zoom and image levels.
+        """
+        return (zoom_level, self.processing_tile_size, self._tile_range(new_coordinates),
+                shadow, mid, highlight)
+
     def _calculate_crop(self, 
                        new_coordinates: QRectF, 
                        new_zoom_level: int,
                        shadow: int,
                        mid: int,
                        highlight: int,
-                       autoset_levels: bool):
+                       autoset_levels: bool,
+                       scene_to_item: QTransform = None,
+                       state = None):
         """
         Given coordinates, the zoom level, and desired image levels, grab the respective
         crop of the image, composed of tiles, and pull into memory. Image levels are then computed across
@@ -1124,95 +1645,124 @@ class BaseImageGraphicsItem(QGraphicsItem):
             Desired white point.
         autosetLevels: bool
             Whether to autoset the color levels, based on the image contained within the new_coordinates.
+        scene_to_item: QTransform | None
+            Mapping of scene coordinates to item coordinates. Taken from the item if not given.
+        state: BaseImageGraphicsItem | CropRenderState | None
+            Holder of the tile cache, current crop and levels to use and update. 
+            The item itself if not given.
         
         Returns
         -------
         crop: np.array
             Computer crop, consisting of all loaded tiles stitched together, with image levels adjusted.
         """
-        with h5py.File(self.image_file, "r") as image_data:
-            # Get correct pyramid level
-            # Zoom < 0, use original image
-            if new_zoom_level <= 0:
-                pyramid_level = image_data[self.original_image_key]
-            # Zoom > max, use max image
-            elif new_zoom_level > self.get_max_zoom():
-                # If zooming out, but only one zoom level exists, use original
-                if self.get_max_zoom() == 0:
-                    pyramid_level = image_data[self.original_image_key]
-                else:
-                    pyramid_level = image_data["pyramid"][str(self.get_max_zoom())]
+        if state is None:
+            state = self
+
+        # Get correct pyramid level
+        # Zoom < 0, use original image
+        if new_zoom_level <= 0:
+            pyramid_level = self._pyramid_levels[-1]
+        # Zoom > max, use max image
+        elif new_zoom_level > self.get_max_zoom():
+            # If zooming out, but only one zoom level exists, use original
+            if self.get_max_zoom() == 0:
+                pyramid_level = self._pyramid_levels[-1]
             else:
-                pyramid_level = image_data["pyramid"][str(new_zoom_level)]
-
-            # Determine the scene coordinates of the tiles to load in.
-            x_tile_min_scene = max(int(new_coordinates.left()), 0) // self.processing_tile_size
-            x_tile_max_scene = int(new_coordinates.right()) // self.processing_tile_size
-            y_tile_min_scene = max(int(new_coordinates.top()), 0) // self.processing_tile_size
-            y_tile_max_scene = int(new_coordinates.bottom()) // self.processing_tile_size
-
-            # Translate the scene tile coordinates into item coordinates
-            item_coordinates = self.mapRectFromScene(x_tile_min_scene * self.processing_tile_size, 
-                                                     y_tile_min_scene * self.processing_tile_size,
-                                                     (((x_tile_max_scene-x_tile_min_scene)+1) * self.processing_tile_size),
-                                                     (((y_tile_max_scene-y_tile_min_scene)+1) * self.processing_tile_size))
-
-            # Get the correct bounds of the edges of the tiles
-            x_min_item = max(int(item_coordinates.left()), 0)
-            x_max_item = min(int(item_coordinates.right()), pyramid_level.shape[1])
-            y_min_item = max(int(item_coordinates.top()), 0)
-            y_max_item = min(int(item_coordinates.bottom()), pyramid_level.shape[0])
-
-            # Used to know where to paint in paint()
-            self.paint_x_coord = x_min_item
-            self.paint_y_coord = y_min_item
+                pyramid_level = self._pyramid_levels[self.get_max_zoom()]
+        else:
+            pyramid_level = self._pyramid_levels[new_zoom_level]
+
+        if scene_to_item is None:
+            scene_to_item, _ = self.sceneTransform().inverted()
+
+        # Throw away all of our cached tiles if they are of a different resolution
+        tile_cache_key = (pyramid_level.name, scene_to_item.m11(), scene_to_item.m22())
+        if tile_cache_key != state._tile_cache_key:
+            state.current_crop_list = {}
+            state.raw_crop = None
+            state.tile_extremes = {}
+            state._tile_cache_key = tile_cache_key
+
+        # Determine the scene coordinates of the tiles to load in.
+        x_tile_min_scene, x_tile_max_scene, y_tile_min_scene, y_tile_max_scene = \
+            self._tile_range(new_coordinates)
+
+        # Translate the scene tile coordinates into item coordinates
+        item_coordinates = scene_to_item.mapRect(QRectF(x_tile_min_scene * self.processing_tile_size, 
+                                                        y_tile_min_scene * self.processing_tile_size,
+                                                        (((x_tile_max_scene-x_tile_min_scene)+1) * self.processing_tile_size),
+                                                        (((y_tile_max_scene-y_tile_min_scene)+1) * self.processing_tile_size)))
+
+        # Get the correct bounds of the edges of the tiles
+        level_height, level_width = pyramid_level.shape[:2]
+        x_min_item = max(int(item_coordinates.left()), 0)
+        x_max_item = min(int(item_coordinates.right()), level_width)
+        y_min_item = max(int(item_coordinates.top()), 0)
+        y_max_item = min(int(item_coordinates.bottom()), level_height)
+
+        # Used to know where to paint in paint()
+        state.paint_x_coord = x_min_item
+        state.paint_y_coord = y_min_item
             
-            # Check if the loaded tiles have changed. We need to assert that the exact same tiles are needed.
-            new_tiles = False
-            tiles_needed = []
-            for x in range(x_tile_min_scene, x_tile_max_scene+1):
-                for y in range(y_tile_min_scene, y_tile_max_scene+1):
-                    tiles_needed.append((x,y))
-                    if (x,y) not in self.current_crop_list:
-                        new_tiles=True
-            # If the current crop has tiles we no longer need, we will have to remove them
-            if len(self.current_crop_list.keys()) != len(tiles_needed):
-                new_tiles = True
+        # Check if the loaded tiles have changed. We need to assert that the exact same tiles are needed,
+        # i.e. no tiles are missing and the current crop has no tiles we no longer need.
+        tiles_needed = {(x, y) for x in range(x_tile_min_scene, x_tile_max_scene+1)
+                        for y in range(y_tile_min_scene, y_tile_max_scene+1)}
+        new_tiles = tiles_needed != state.current_crop_list.keys() or state._crop_from_render_cache
                 
-            # Check if there are new image levels
-            new_image_levels = False
-            if (shadow != self.current_shadow) or \
-                (mid != self.current_mid) or \
-                (highlight != self.current_highlight):
-                new_image_levels = True
+        # Check if there are new image levels
+        new_image_levels = False
+        if (shadow != state.current_shadow) or \
+            (mid != state.current_mid) or \
+            (highlight != state.current_highlight):
+            new_image_levels = True
             
-            # If the viewport does not contain the image, return None, don't display anything
-            if x_min_item >= x_max_item or y_min_item >= y_max_item:
-                return None
-            elif new_tiles or new_image_levels or autoset_levels:
+        # If the viewport does not contain the image, return None, don't display anything
+        if x_min_item >= x_max_item or y_min_item >= y_max_item:
+            return None
+        elif new_tiles or new_image_levels or autoset_levels:
+            # When only the image levels change, reuse the crop stitched from the same tiles
+            if new_tiles or state.raw_crop is None:
                 new_crop = self._collect_processing_tiles(pyramid_level, 
                                                x_tile_min_scene=x_tile_min_scene,
                                                x_tile_max_scene=x_tile_max_scene,
                                                y_tile_min_scene=y_tile_min_scene,
-                                               y_tile_max_scene=y_tile_max_scene,)
-
-                if autoset_levels:
-                    # Grab crop of only the viewport
-                    window_coordinates = self.mapRectFromScene(new_coordinates)
-                    window_crop = pyramid_level[int(window_coordinates.top()) : int(window_coordinates.bottom()),
-                                                int(window_coordinates.left()) : int(window_coordinates.right())]
-                    # Calculate image levels based on viewport crop.
-                    shadow, mid, highlight = self._calculate_auto_image_levels(window_crop)
-
-                # Apply current image values to current crop
-                new_crop = self._compute_new_image_levels(new_crop,
-                                                    shadow, 
-                                                    mid, 
-                                                    highlight)
+                                               y_tile_max_scene=y_tile_max_scene,
+                                               scene_to_item=scene_to_item,
+                                               state=state)
             else:
-                new_crop = self.current_crop
+                new_crop = state.raw_crop
+            state._crop_from_render_cache = False
+
+            # Read ahead the tiles around the new ones, once back on the UI thread
+            if new_tiles:
+                state._prefetch_request = (pyramid_level, x_tile_min_scene, x_tile_max_scene,
+                                           y_tile_min_scene, y_tile_max_scene, scene_to_item)
+
+            if autoset_levels:
+                # Grab crop of only the viewport, out of the tiles just loaded
+                window_coordinates = scene_to_item.mapRect(new_coordinates)
+                window_top = max(int(window_coordinates.top()) - y_min_item, 0)
+                window_left = max(int(window_coordinates.left()) - x_min_item, 0)
+                window_crop = new_crop[window_top : max(int(window_coordinates.bottom()) - y_min_item, window_top),
+                                       window_left : max(int(window_coordinates.right()) - x_min_item, window_left)]
+                # Calculate image levels based on viewport crop.
+                shadow, mid, highlight = self._calculate_auto_image_levels(window_crop)
+
+            # Apply current image values to current crop
+            image_min, image_max = state.current_crop_extremes or (None, None)
+            new_crop = self._compute_new_image_levels(new_crop,
+                                                shadow, 
+                                                mid, 
+                                                highlight,
+                                                image_min=image_min,
+                                                image_max=image_max,
+                                                state=state)
+        else:
+            new_crop = state.current_crop
 
-            return new_crop
+        return new_crop
             
             
     def _collect_processing_tiles(self, 
@@ -1220,105 +1770,341 @@ class BaseImageGraphicsItem(QGraphicsItem):
                        x_tile_min_scene: int, 
                        x_tile_max_scene: int, 
                        y_tile_min_scene: int, 
-                       y_tile_max_scene: int):
+                       y_tile_max_scene: int,
+                       scene_to_item: QTransform = None,
+                       state = None):
         """
         Collect all necessary tiles into memory, stitching them all into a single
-        numpy array.
+        numpy array. The tile cache is taken from and updated in state, the item
+        itself by default.
 
         This function is distinct from _collect_processing_tiles().
         _collect_processing_tiles() is used for dynamically loading parts of the image
         into memory. _make_display_tiles() is for displaying very large image crops, 
         because QT has a size limit on the pixmaps.
         """
+        if state is None:
+            state = self
+
         # For each tile, load it in if it is not yet loaded
         # Remove all tiles from current crop that don't match
         new_crop_list = {}
+        new_tile_extremes = {}
+        level_height, level_width = pyramid_level.shape[:2]
+        if scene_to_item is None:
+            scene_to_item, _ = self.sceneTransform().inverted()
 
-        x_arrays = []
+        # Find where each tile comes from: the tiles in memory, or the bounds to read
+        columns = []
         for x in range(x_tile_min_scene, x_tile_max_scene+1):
-            y_arrays = []
+            column = []
             for y in range(y_tile_min_scene, y_tile_max_scene+1):
-                # If the tile is currently loaded, pop it from the current crop list and append it to the new one
-                if (x,y) in self.current_crop_list:
-                    crop = self.current_crop_list.pop((x,y))
+                # If the tile is currently loaded, pop it from the current crop list to reuse it
+                if (x,y) in state.current_crop_list:
+                    tile = state.current_crop_list.pop((x,y))
+                    if (x,y) in state.tile_extremes:
+                        new_tile_extremes[(x,y)] = state.tile_extremes[(x,y)]
+                # If the tile was read ahead in the background, take it from there
+                elif (pyramid_level.name, x, y) in state.prefetched_tiles:
+                    tile = state.prefetched_tiles.pop((pyramid_level.name, x, y))
                 else:
-                    # If the tile is not currently loaded, load it in
-                    # Calculate crop for tile
-                    crop_coordinates = self.mapRectFromScene(self.processing_tile_size*x, 
-                                                            self.processing_tile_size*y,
-                                                            self.processing_tile_size,
-                                                            self.processing_tile_size)
+                    # If the tile is not currently loaded, calculate its bounds to load it in
+                    crop_coordinates = scene_to_item.mapRect(QRectF(self.processing_tile_size*x, 
+                                                                    self.processing_tile_size*y,
+                                                                    self.processing_tile_size,
+                                                                    self.processing_tile_size))
 
                     # If the tile starts after the image, but the tile is still in the viewport, skip loading anything
-                    if crop_coordinates.top() > pyramid_level.shape[0] or crop_coordinates.left() > pyramid_level.shape[1]:
+                    if crop_coordinates.top() > level_height or crop_coordinates.left() > level_width:
                         continue
 
-                    x_limit = min(crop_coordinates.right(), pyramid_level.shape[1])
-                    y_limit = min(crop_coordinates.bottom(), pyramid_level.shape[0])
-                    
-                    # Pull the crop into memory
-                    crop = pyramid_level[int(crop_coordinates.top()) : int(y_limit), 
-                                        int(crop_coordinates.left()) : int(x_limit)]
+                    top = int(crop_coordinates.top())
+                    left = int(crop_coordinates.left())
+                    bottom = max(int(min(crop_coordinates.bottom(), level_height)), top)
+                    right = max(int(min(crop_coordinates.right(), level_width)), left)
+                    tile = (top, bottom, left, right)
+
+                column.append((x, y, tile))
+            if len(column) != 0:
+                columns.append(column)
+
+        def tile_shape(tile):
+            if isinstance(tile, tuple):
+                top, bottom, left, right = tile
+                return (bottom - top, right - left)
+            return tile.shape[:2]
+
+        # Stitch together all the tiles, reading the new ones straight into place.
+        # The tiles are kept as views of the crop, so only the current crop stays in memory.
+        heights = [tile_shape(tile)[0] for _, _, tile in columns[0]] if len(columns) != 0 else []
+        widths = [tile_shape(column[0][2])[1] for column in columns]
+        new_crop = np.empty((sum(heights), sum(widths)) + pyramid_level.shape[2:], dtype=pyramid_level.dtype)
+        col_start = 0
+        for column, width in zip(columns, widths):
+            row_start = 0
+            for x, y, tile in column:
+                height = tile_shape(tile)[0]
+                crop_sel = np.s_[row_start:row_start + height, col_start:col_start + width]
+                if isinstance(tile, tuple):
+                    self._read_tile(pyramid_level, tile, new_crop, crop_sel)
+                else:
+                    new_crop[crop_sel] = tile
+                crop = new_crop[crop_sel]
+
+                # Scan each tile for its min and max only once, when it is first used
+                if (x, y) not in new_tile_extremes and crop.size != 0:
+                    new_tile_extremes[(x, y)] = (float(crop.min()), float(crop.max()))
 
-                y_arrays.append(crop)
                 new_crop_list[(x, y)] = crop
-            if len(y_arrays) != 0:
-                x_arrays.append(np.concatenate(y_arrays, axis=0))
-        # Stitch together all the tiles.
-        new_crop = np.concatenate(x_arrays, axis=1)
-
-        self.current_crop_list = new_crop_list
+                row_start += height
+            col_start += width
+
+        state.current_crop_list = new_crop_list
+        state.raw_crop = new_crop
+        state.tile_extremes = new_tile_extremes
+        if len(new_tile_extremes) != 0:
+            state.current_crop_extremes = (min(mn for mn, _ in new_tile_extremes.values()),
+                                          max(mx for _, mx in new_tile_extremes.values()))
+        else:
+            state.current_crop_extremes = None
 
         return new_crop
 
+
+    def _read_tile(self, pyramid_level, bounds: tuple, out: np.ndarray, out_sel: tuple = None):
+        """
+        Read the tile of the level within bounds, (top, bottom, left, right), into
+        out[out_sel], or all of out if out_sel isn't given. Tiles that are exactly one
+        unfiltered chunk are read as is, through a scratch array if out[out_sel]
+        isn't contiguous.
+        """
+        top, bottom, left, right = bounds
+        dest = out if out_sel is None else out[out_sel]
+        if dest.size == 0:
+            return
+        if pyramid_level.name in self._raw_chunk_levels and dest.shape == pyramid_level.chunks:
+            chunk = dest if dest.flags.c_contiguous else np.empty(dest.shape, dtype=dest.dtype)
+            if self._read_chunk_direct(pyramid_level, top, left, chunk):
+                if chunk is not dest:
+                    dest[...] = chunk
+                return
+        pyramid_level.read_direct(out, np.s_[top:bottom, left:right], out_sel)
+
+    def _read_chunk_direct(self, pyramid_level: h5py.Dataset, top: int, left: int, out: np.ndarray):
+        """
+        If the tile at (top, left), shaped like out, is exactly one interior chunk
+        of an unfiltered level, read the chunk's bytes straight into out, skipping
+        the hyperslab selection.
+
+        Returns
+        -------
+        bool
+            Whether the tile was read.
+        """
+        if pyramid_level.name not in self._raw_chunk_levels or out.shape != pyramid_level.chunks:
+            return False
+        if top % out.shape[0] != 0 or left % out.shape[1] != 0 or not out.flags.c_contiguous:
+            return False
+        try:
+            offsets = (top, left) + (0,) * (out.ndim - 2)
+            pyramid_level.id.read_direct_chunk(offsets, out=out.reshape(-1).view(np.uint8))
+        except RuntimeError:
+            # The chunk was never written; the regular read returns the fill value
+            return False
+        return True
+
+    def _prefetch_neighbor_tiles(self,
+                                 pyramid_level: h5py.Dataset,
+                                 x_tile_min_scene: int,
+                                 x_tile_max_scene: int,
+                                 y_tile_min_scene: int,
+                                 y_tile_max_scene: int,
+                                 scene_to_item: QTransform = None):
+        """
+        Read the ring of tiles bordering the given tiles in a background thread,
+        so panning onto them doesn't have to wait on the file.
+
+        Tile bounds are computed here, because the mapping depends on the 
+        current scale of the item.
+        """
+        self._prefetch_generation += 1
+        self._prefetch_pool.clear()
+        # In-memory levels have nothing to read ahead
+        if isinstance(pyramid_level, RuntimePyramidLevel):
+            return
+        level_height, level_width = pyramid_level.shape[:2]
+        if scene_to_item is None:
+            scene_to_item, _ = self.sceneTransform().inverted()
+
+        tiles = []
+        for x in range(x_tile_min_scene-1, x_tile_max_scene+2):
+            for y in range(y_tile_min_scene-1, y_tile_max_scene+2):
+                # Skip tiles that are loaded, or inside the loaded block
+                if (x_tile_min_scene <= x <= x_tile_max_scene and
+                    y_tile_min_scene <= y <= y_tile_max_scene):
+                    continue
+                if x < 0 or y < 0:
+                    continue
+                if (pyramid_level.name, x, y) in self.prefetched_tiles:
+                    tiles.append((x, y, None))
+                    continue
+
+                crop_coordinates = scene_to_item.mapRect(QRectF(self.processing_tile_size*x, 
+                                                                self.processing_tile_size*y,
+                                                                self.processing_tile_size,
+                                                                self.processing_tile_size))
+                if crop_coordinates.top() > level_height or crop_coordinates.left() > level_width:
+                    continue
+
+                tiles.append((x, y, (int(crop_coordinates.top()),
+                                     int(min(crop_coordinates.bottom(), level_height)),
+                                     int(crop_coordinates.left()),
+                                     int(min(crop_coordinates.right(), level_width)))))
+
+        # Drop prefetched tiles that are no longer next to the viewport
+        keep = {(pyramid_level.name, x, y) for x, y, _ in tiles}
+        self.prefetched_tiles = {key: tile for key, tile in self.prefetched_tiles.items() if key in keep}
+
+        to_read = [(x, y, bounds) for x, y, bounds in tiles if bounds is not None]
+        if len(to_read) != 0:
+            self._prefetch_pool.start(TilePrefetcher(self, 
+                                                     self._prefetch_generation,
+                                                     pyramid_level, 
+                                                     to_read))
+
     
     def _compute_new_image_levels(self,
                                 image: np.array,
                                 shadow: int,
                                 mid: int,
-                                highlight: int):
+                                highlight: int,
+                                image_min: float = None,
+                                image_max: float = None,
+                                state = None):
         """
         Computes image levels on the given crop, image, by gamma correction, 
-        rescaling to 8 bit, and adding necessary padding
+        rescaling to 8 bit, and adding necessary padding.  The min and max of 
+        the image are computed if they aren't given. The current levels are set
+        in state, the item itself by default.
         """
+        if state is None:
+            state = self
+
         if shadow:
-            self.current_shadow = shadow
+            state.current_shadow = shadow
         if mid:
-            self.current_mid = mid
+            state.current_mid = mid
         if highlight:
-            self.current_highlight = highlight
+            state.current_highlight = highlight
 
         if image is None:
-            image = self.current_crop.astype(float)
-        else:
-            image = image.astype(float)
+            image = state.current_crop
         
-        image_max = float(image.max())
-        image_min = float(image.min())
+        if image_max is None:
+            image_max = float(image.max())
+        if image_min is None:
+            image_min = float(image.min())
 
         # If all one color, it doesn't make sense to adjust because there is no contrast
         if image_max - image_min != 0:
-            # Rescale the image, and shadow, midtones, and highlights
-            # values to be between 0 and 1
-            image = (image-image_min)/(image_max-image_min)
-            shadow = float(shadow-image_min)/float(image_max-image_min)
+            # Only the midtone has to be relative to the image range, to pick the gamma.
+            # Applying shadows and highlights in the image's own units is equivalent.
             mid = float(mid-image_min)/float(image_max-image_min)
-            highlight = float(highlight-image_min)/float(image_max-image_min)
+            gamma_correct = self._gamma_exponent(mid)
             
-            image = self._gamma_correct(image, shadow, mid, highlight)
-
             if len(image.shape) > 3 or len(image.shape) < 2:
                 sys.exit("Image not shaped properly.")
             
-            image = self._rescale_to_8_bit(image)
-
+            # Write the 8 bit image straight into its padded buffer
             if len(image.shape) == 2:
-                pad = self._get_pad(image)
-                image = np.concatenate((image, pad), axis=1)
+                out = np.zeros((image.shape[0], image.shape[1] + self._get_pad_width(image.shape[1])),
+                               dtype=np.uint8)
+                out_image = out[:, :image.shape[1]]
+            else:
+                out = out_image = np.empty(image.shape, dtype=np.uint8)
+            
+            # For 8 and 16 bit integer crops, compute every possible value once
+            # and look the pixels up, instead of doing the math on each pixel
+            lut_size = 2**(8*image.dtype.itemsize)
+            if image.dtype.kind in "ui" and image.dtype.itemsize <= 2 and image.size > lut_size:
+                key = (image.dtype, image_min, image_max, shadow, highlight, gamma_correct)
+                if key != state._levels_lut_key:
+                    # Ordered so that negative values of signed types index from the end
+                    values = np.arange(lut_size, dtype=f"u{image.dtype.itemsize}").view(image.dtype)
+                    state._levels_lut = self._levels_to_8_bit(values, image_min, image_max, 
+                                                             shadow, highlight, gamma_correct)
+                    state._levels_lut_key = key
+                lut = state._levels_lut
+                self._run_in_bands(lambda rows: np.take(lut, image[rows], out=out_image[rows], mode="wrap"),
+                                   image)
+            else:
+                self._levels_to_8_bit(image, image_min, image_max, 
+                                      shadow, highlight, gamma_correct, out=out_image)
+            image = out
+        else:
+            image = image.astype(float)
 
         return image
 
 
+    def _levels_to_8_bit(self,
+                         image: np.ndarray,
+                         image_min: float,
+                         image_max: float,
+                         shadow: float,
+                         highlight: float,
+                         gamma_correct: Union[float, None],
+                         out: np.ndarray = None):
+        """Apply shadows, highlights and gamma correction to the
+        image, and rescale the result to 8 bit, such that image_min
+        maps to 0 and image_max to 255.  The result is written to
+        out, if given.  Large images are processed in bands of rows, in parallel.
+        """
+        # The levels are monotonic, so the corrected image's extremes are
+        # those of the original image, without scanning it again
+        extremes = np.array([image_min, image_max])
+        mn, mx = self._apply_levels(extremes.copy(), shadow, highlight, gamma_correct)
+        
+        # Single precision is plenty for 8-bit display, and halves the memory traffic,
+        # unless the corrected range is too narrow to stretch back out to 8 bits
+        if mx - mn > 1e-4 * mx and mx > 1e-30:
+            dtype = np.float32
+        else:
+            dtype = np.float64
+        # Extremes in the same precision as the pixels, so they land exactly on 0 and 255
+        mn, mx = self._apply_levels(extremes.astype(dtype), shadow, highlight, gamma_correct)
+        if out is None:
+            out = np.empty(image.shape, dtype=np.uint8)
+
+        def levels_band(rows: slice):
+            # All the steps below work in this one copy of the band
+            band = image[rows].astype(dtype)
+            band = self._apply_levels(band, shadow, highlight, gamma_correct)
+            self._rescale_to_8_bit(band, mx=mx, mn=mn, out=out[rows], overwrite_input=True, clip=clip)
+
+        # The levels clip the image to [0, 1]. If that is the range between the 
+        # extremes too, the rescaled image is within [0, 255] without clipping it.
+        clip = not (mn == 0 and mx == 1)
+
+        self._run_in_bands(levels_band, image)
+        return out
+
+
+    def _run_in_bands(self, band_func, image: np.ndarray):
+        """Call band_func with slices covering the rows of image, 
+        in parallel for large images.  Every pixel of the levels 
+        is independent, so bands of rows can be done separately.
+        """
+        num_bands = int(min(LEVELS_THREADS, max(image.size // LEVELS_BAND_PIXELS, 1), len(image)))
+        if num_bands <= 1:
+            band_func(slice(None))
+        else:
+            band_height = -(-len(image) // num_bands)
+            bands = [slice(start, start + band_height) for start in range(0, len(image), band_height)]
+            # Consume the results, so errors in the bands are raised here
+            list(_get_levels_executor().map(band_func, bands))
+
+
     def _gamma_correct(self,
                       image: np.ndarray,
                       shadow: float,
@@ -1346,7 +2132,17 @@ class BaseImageGraphicsItem(QGraphicsItem):
             The image with gamma correction applied.  Will be 
             type float with values between 0 and 1.
         """
-        
+        return self._apply_levels(np.array(image, dtype=float), 
+                                  shadow, 
+                                  highlight, 
+                                  self._gamma_exponent(mid))
+
+
+    def _gamma_exponent(self, mid: float):
+        """Compute the gamma correction exponent for the given
+        midtone, between 0 and 1.  Returns None if the midtone
+        is centered, within rounding, and no gamma correction is needed.
+        """
         image_mid = 0.5
         gamma = 1
         
@@ -1363,16 +2159,39 @@ class BaseImageGraphicsItem(QGraphicsItem):
             if gamma < 0.01:
                 gamma = 0.01
         
-        gamma_correct = 1/gamma
+        # The midtone is usually relative to the image range, so a centered
+        # one may be off by rounding. Its exponent would change nothing.
+        if abs(1/gamma - 1) < 1e-6:
+            return None
+        
+        return 1/gamma
+
+
+    def _apply_levels(self,
+                      image: np.ndarray,
+                      shadow: float,
+                      highlight: float,
+                      gamma_correct: Union[float, None]):
+        """Apply shadows, highlights and the gamma correction
+        exponent in place, on a float-valued image.  shadow and 
+        highlight are in the units of the image.  The arithmetic
+        is done in the image's precision.
+        
+        Returns
+        -------
+        numpy.ndarray
+            The image, with values between 0 and 1.
+        """
+        dtype = image.dtype.type
         
         # Apply shadows and highlights
-        image = (image - shadow)/(highlight - shadow)
-        image [image < 0] = 0
-        image [image > 1] = 1
+        image -= dtype(shadow)
+        image /= (dtype(highlight) - dtype(shadow))
+        np.clip(image, 0, 1, out=image)
         
         # Apply gamma
-        if mid != image_mid:
-            image = image**gamma_correct
+        if gamma_correct is not None:
+            np.power(image, dtype(gamma_correct), out=image)
         
         return image
     
@@ -1383,13 +2202,7 @@ class BaseImageGraphicsItem(QGraphicsItem):
         8-bit.
         """
         if len(image.shape) == 2:
-            rem = image.shape[1]%4
-            if rem > 0:
-                pad_amt = 4-rem
-            else:
-                pad_amt = 0
-            
-            pad = np.zeros((image.shape[0], pad_amt), dtype=image.dtype)
+            pad = np.zeros((image.shape[0], self._get_pad_width(image.shape[1])), dtype=image.dtype)
         
         else:
             # @TODO: Shouldn't hit this ever because we check the
@@ -1399,11 +2212,23 @@ class BaseImageGraphicsItem(QGraphicsItem):
         return pad
     
 
-    def _rescale_to_8_bit(self, image, mx=None, mn=None):
+    @staticmethod
+    def _get_pad_width(width: int):
+        """Get the number of 8-bit columns needed to 32-bit align
+        a greyscale row of the given width.
+        """
+        return -width % 4
+    
+
+    def _rescale_to_8_bit(self, image, mx=None, mn=None, out=None, overwrite_input=False, clip=True):
         """Converts the image to np.uint8 type and linearly
         rescales such that the entire 0-255 space is used, i.e. 
         the max value in the image is mapped to 255 and the min
-        value is mapped to 0.
+        value is mapped to 0.  The result is written to out, a 
+        np.uint8 array, if given.  If overwrite_input is True, a
+        floating point image is rescaled in place.  If clip is
+        False, the image must already be within [0, 1] and [mn, mx],
+        and the clipping pass is skipped.
         """
         if mx is None:
             mx = image.max()
@@ -1415,30 +2240,38 @@ class BaseImageGraphicsItem(QGraphicsItem):
             # If the min and max of the image are the same, it's just one color, 
             # and we don't need to rescale
             # return image.astype(np.uint8)
-            mx = 255
-            mn = 0
-            diff = mx-mn
+            out_image = image*1.0
         else:
-            diff = mx-mn
-        
-        # Compute slope and offset
-        m = 255.0/(diff)
-        b = 255.0*mn/(diff)*(-1.0)
-        
-        # Apply slope and offset
-        out_image = (image*m + b)
-        out_image[out_image > 255] = 255
-        out_image[out_image < 0] = 0
-        out_image = out_image.astype(np.uint8)
-        
-        return out_image
+            # Work in the image's precision, if it is floating point
+            dtype = image.dtype.type if image.dtype.kind == "f" else np.float64
+            mn = dtype(mn)
+            diff = dtype(mx) - mn
+            
+            # Apply offset and slope. Dividing by the range, rather than multiplying
+            # by its reciprocal, maps mx to exactly 255.
+            if overwrite_input and image.dtype.kind == "f":
+                out_image = np.subtract(image, mn, out=image)
+            else:
+                out_image = image - mn
+            out_image /= diff
+            out_image *= 255
+        
+        # Casting truncates, so values off by rounding still land on 0 or 255
+        if clip:
+            np.clip(out_image, 0, 255, out=out_image)
+        if out is None:
+            return out_image.astype(np.uint8)
+        
+        np.copyto(out, out_image, casting="unsafe")
+        return out
     
     
     def _calculate_auto_image_levels(self,
                                      image: np.array):
         """
         Calculate the blacks, mids, and highlights automatically based
-        on the given crop.
+        on the given crop.  Large crops are evenly subsampled to about
+        AUTO_LEVELS_SAMPLES pixels first.
         
         Returns
         -------
@@ -1450,6 +2283,11 @@ class BaseImageGraphicsItem(QGraphicsItem):
             The maximum inside rectf; used as the highlight value
         
         """
+        # Strided views, so non-contiguous crops aren't copied
+        step = int(np.ceil(np.sqrt(image.shape[0] * image.shape[1] / AUTO_LEVELS_SAMPLES)))
+        if step > 1:
+            image = image[::step, ::step]
+
         shadow = image.min()
         highlight = image.max()
         mid = int((highlight-shadow)/2) + shadow
@@ -1461,7 +2299,7 @@ class BaseImageGraphicsItem(QGraphicsItem):
 
         return (shadow, mid, highlight)
     
-    def _make_display_tiles(self, image):
+    def _make_display_tiles(self, image, state = None):
         """
         Breaks a processed image up into tiles.
 
@@ -1475,42 +2313,26 @@ class BaseImageGraphicsItem(QGraphicsItem):
         _collect_processing_tiles() is used for dynamically loading parts of the image
         into memory. _make_display_tiles() is for displaying very large image crops, 
         because QT has a size limit on the pixmaps.
+
+        The number of tiles is set in state, the item itself by default.
         """
+        if state is None:
+            state = self
         
-        tiles = []
-        # Prepare to make tiles
-        if image.shape[0] % self.display_tile_size == 0:
-            self.num_tiles_h = int(image.shape[0]/self.display_tile_size)
-        else:
-            self.num_tiles_h = int(image.shape[0]/self.display_tile_size)+1
-            
-        if image.shape[1] % self.display_tile_size == 0:
-            self.num_tiles_w = int(image.shape[1]/self.display_tile_size)
-        else:
-            self.num_tiles_w = int(image.shape[1]/self.display_tile_size)+1
-        
-        # Make all tiles except last row
-        for j in range(self.num_tiles_h-1):
-            new_row = []
-            for i in range(self.num_tiles_w-1):
-                new_row.append(image[self.display_tile_size*j : self.display_tile_size*(j+1),
-                                     self.display_tile_size*i : self.display_tile_size*(i+1)])
-            new_row.append(image[self.display_tile_size*j : self.display_tile_size*(j+1),
-                                 self.display_tile_size*(self.num_tiles_w-1) :])
-            tiles.append(new_row)
-        
-        # Make last row of tiles
-        new_row = []
-        for i in range(self.num_tiles_w-1):
-            new_row.append(image[self.display_tile_size*(self.num_tiles_h-1) :,
-                                 self.display_tile_size*i : self.display_tile_size*(i+1)])
-        
-        # Make bottom corner tile
-        new_row.append(image[self.display_tile_size*(self.num_tiles_h-1) :,
-                             self.display_tile_size*(self.num_tiles_w-1) :])
-        tiles.append(new_row)
-        
-        return tiles
+        size = self.display_tile_size
+        # Common case: the whole crop fits in a single pixmap
+        if image.shape[0] <= size and image.shape[1] <= size:
+            state.num_tiles_h = 1
+            state.num_tiles_w = 1
+            return [[image]]
+
+        # Tiles are slices of the crop, so no pixel data is copied here
+        row_slices = [slice(start, start + size) for start in range(0, image.shape[0], size)]
+        col_slices = [slice(start, start + size) for start in range(0, image.shape[1], size)]
+        state.num_tiles_h = len(row_slices)
+        state.num_tiles_w = len(col_slices)
+
+        return [[image[rs, cs] for cs in col_slices] for rs in row_slices]
 
     def _set_pixmaps(self, tiles):
         """Convert the image to a pixmap for display.
@@ -1519,26 +2341,33 @@ class BaseImageGraphicsItem(QGraphicsItem):
         
         # Set up color image
         if len(tiles[0][0].shape) == 3:
-            for j in range(self.num_tiles_h):
-                new_row = []
-                for i in range(self.num_tiles_w):
-                    new_row.append(QPixmap.fromImage(QImage(tiles[j][i].tobytes(),
-                                                            tiles[j][i].shape[1],
-                                                            tiles[j][i].shape[0],
-                                                            tiles[j][i].shape[1]*3,
-                                                            QImage.Format_RGB888)))
-                self.pixmaps.append(new_row)
+            image_format = QImage.Format_RGB888
         
         # Set up greyscale image
         else:
-            for j in range(self.num_tiles_h):
-                new_row = []
-                for i in range(self.num_tiles_w):
-                    new_row.append(QPixmap.fromImage(QImage(tiles[j][i].tobytes(),
-                                                            tiles[j][i].shape[1],
-                                                            tiles[j][i].shape[0],
-                                                            QImage.Format_Grayscale8)))
-                self.pixmaps.append(new_row)
+            image_format = QImage.Format_Grayscale8
+
+        for tile_row in tiles:
+            self.pixmaps.append([self._tile_to_pixmap(tile, image_format)
+                                 for tile in tile_row])
+
+    @staticmethod
+    def _tile_to_pixmap(tile, image_format):
+        """Convert one display tile to a pixmap without copying it to bytes.
+
+        The QImage wraps the tile's own buffer, using the row stride as
+        bytesPerLine so that strided views into the crop can be passed
+        directly. QPixmap.fromImage copies the pixels, so the tile only has
+        to stay alive for the duration of this call.
+        """
+        if not tile[0].flags.c_contiguous:
+            tile = np.ascontiguousarray(tile)
+        image = QImage(sip.voidptr(tile.ctypes.data),
+                       tile.shape[1],
+                       tile.shape[0],
+                       tile.strides[0],
+                       image_format)
+        return QPixmap.fromImage(image)
 
     
     ##########################################################
@@ -1549,10 +2378,7 @@ class BaseImageGraphicsItem(QGraphicsItem):
         
         Reimplementation of QGraphicsItem.boundingRect()
         """
-        top_left = QPointF(0,0)
-        bottom_right = QPointF(self.original_image_length,
-                               self.original_image_height)
-        return QRectF(top_left, bottom_right)
+        return self._bounding_rect
     
 
     def paint(self, painter, option, widget=None):
@@ -1560,16 +2386,152 @@ class BaseImageGraphicsItem(QGraphicsItem):
         
         Reimplementation of QGraphicsItem.paint(...)
         """
-        x_start = max(self.paint_x_coord, 0)
-        y_start = max(self.paint_y_coord, 0)
-
-        for j in range(self.num_tiles_h):
-            for i in range(self.num_tiles_w):
-                painter.drawPixmap(x_start + (i*self.display_tile_size), 
-                                   y_start + (j*self.display_tile_size), 
-                                   self.pixmaps[j][i])
+        for x, y, pixmap in self._display:
+            painter.drawPixmap(x, y, pixmap)
                 
     
+class RuntimePyramidLevel:
+    """
+    A pyramid level held in memory, for images without a pyramid in their file.
+    Provides the parts of the h5py.Dataset interface used to read tiles.
+    """
+    def __init__(self, name: str, data: np.ndarray):
+        self.name = name
+        self.data = data
+        self.shape = data.shape
+        self.dtype = data.dtype
+        self.chunks = None
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def read_direct(self, dest: np.ndarray, source_sel=None, dest_sel=None):
+        dest[... if dest_sel is None else dest_sel] = self.data if source_sel is None else self.data[source_sel]
+
+
+class CropRenderState:
+    """
+    Copy of the part of a BaseImageGraphicsItem that rendering a crop reads and
+    updates: the tile cache, the current crop and its levels, and where it is
+    painted. A background render updates the copy instead of the item, and the
+    UI thread applies it back to the item.
+
+    The dicts that the rendering pops from are copied; the arrays are shared,
+    as the rendering never writes into them.
+    """
+    ATTRIBUTES = ("current_crop_list", "raw_crop", "tile_extremes", "current_crop_extremes",
+                  "current_crop", "current_shadow", "current_mid", "current_highlight",
+                  "paint_x_coord", "paint_y_coord", "num_tiles_h", "num_tiles_w",
+                  "_tile_cache_key", "_crop_from_render_cache", "_levels_lut", "_levels_lut_key",
+                  "_prefetch_request")
+
+    def __init__(self, image_item: BaseImageGraphicsItem):
+        for name in self.ATTRIBUTES:
+            setattr(self, name, getattr(image_item, name))
+        self.current_crop_list = dict(image_item.current_crop_list)
+        # Only read from; the prefetched tiles it uses are dropped from the item's
+        # when the tiles around the new crop are prefetched
+        self.prefetched_tiles = dict(image_item.prefetched_tiles)
+
+    def apply(self, image_item: BaseImageGraphicsItem):
+        """
+        Set the rendered state on the item. Must be called on the UI thread.
+        """
+        for name in self.ATTRIBUTES:
+            setattr(image_item, name, getattr(self, name))
+
+
+class CropRendererSignals(QObject):
+    """
+    Signals of CropRenderer.
+
+    rendered
+        tuple(int, tuple, CropRenderState, object): the render generation, the
+        arguments of BaseImageGraphicsItem._render_crop(), the state it rendered
+        into, and what it returned.
+    """
+    rendered = pyqtSignal(int, tuple, object, object)
+
+
+class CropRenderer(QRunnable):
+    """
+    Renders a crop of a BaseImageGraphicsItem in a background thread, into a
+    copy of the item's render state, and sends both back to be applied and
+    displayed on the UI thread. Skipped if the item has requested a newer
+    render in the meantime.
+    """
+    def __init__(self, 
+                 image_item: BaseImageGraphicsItem,
+                 generation: int,
+                 state: CropRenderState,
+                 render_args: tuple):
+        super(CropRenderer, self).__init__()
+        self.image_item = image_item
+        self.generation = generation
+        self.state = state
+        self.render_args = render_args
+
+    def run(self):
+        if self.generation != self.image_item._render_generation:
+            return
+        try:
+            rendered = self.image_item._render_crop(*self.render_args, state=self.state)
+        except Exception:
+            logger.exception("Rendering the image failed")
+            return
+        self.image_item._render_signals.rendered.emit(self.generation, self.render_args,
+                                                      self.state, rendered)
+
+
+class TilePrefetcherSignals(QObject):
+    """
+    Signals of TilePrefetcher.
+
+    prefetched
+        tuple(int, str, int, int, object): the prefetch generation, the pyramid
+        level name, the x and y tile indexes, and the tile.
+    """
+    prefetched = pyqtSignal(int, str, int, int, object)
+
+
+class TilePrefetcher(QRunnable):
+    """
+    Reads tiles of one pyramid level in a background thread, and sends each one
+    back to be put in the prefetched_tiles cache of a BaseImageGraphicsItem on
+    the UI thread. Stops, and results are dropped, if the item has scheduled a
+    newer prefetch in the meantime.
+
+    The dataset belongs to the item's open file; h5py serializes access to it,
+    and the item waits for the prefetch to finish before closing the file.
+    """
+    def __init__(self, 
+                 image_item: BaseImageGraphicsItem,
+                 generation: int,
+                 pyramid_level: h5py.Dataset,
+                 tiles: list):
+        super(TilePrefetcher, self).__init__()
+        self.image_item = image_item
+        self.generation = generation
+        self.pyramid_level = pyramid_level
+        self.level_name = pyramid_level.name
+        self.tiles = tiles
+
+    def run(self):
+        try:
+            for x, y, bounds in self.tiles:
+                if self.generation != self.image_item._prefetch_generation:
+                    return
+                top, bottom, left, right = bounds
+                tile = np.empty((bottom - top, right - left) + self.pyramid_level.shape[2:],
+                                dtype=self.pyramid_level.dtype)
+                self.image_item._read_tile(self.pyramid_level, bounds, tile)
+                self.image_item._prefetch_signals.prefetched.emit(self.generation, self.level_name,
+                                                                  x, y, tile)
+        except Exception:
+            # Prefetching is only an optimization; tiles are read on demand otherwise
+            logger.debug("Tile prefetch failed", exc_info=True)
+
+
 class BaseGrid(QGraphicsItem):
     """
     Represents base grid to draw all polygon items on.
@@ -1583,13 +2545,12 @@ class BaseGrid(QGraphicsItem):
 
         self.width = width
         self.height = height
+        self._bounding_rect = QRectF(0, 0, width, height)
     
     def boundingRect(self):
         """Return the bounding rect
         """
-        top_left = QPointF(0,0)
-        bottom_right = QPointF(self.width, self.height)
-        return QRectF(top_left, bottom_right)
+        return self._bounding_rect
 
     def paint(self, painter, option, widget=None):
         pass # Don't need to paint anything, just need to have this defined
@@ -1687,8 +2648,7 @@ class commandDeleteHandle(QUndoCommand):
         self.handle_ind = handle_ind
         self.undone_flag = False
         
-        pos = self.label_item.getVertices()[self.handle_ind]
-        self.handle_pos = QPointF(pos[0], pos[1])
+        self.handle_pos = QPointF(*self.label_item.getVertex(self.handle_ind))
     
     def redo(self):
         if self.undone_flag:
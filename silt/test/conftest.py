@@ -0,0 +1,52 @@
+import pytest
+
+@pytest.fixture(scope="session")
+def param_default():
+    param = {
+                "image_key": "data",
+                "input_image": "data",
+                "output_destination":"pyramid",
+                "target":"test",
+                "blocksize":500,
+                "downsample":2,
+                "sigma":4,
+                "radius":3,
+                "max_length":1024
+            }
+        
+    return param
+
+@pytest.fixture(scope="session")
+def param_small():
+    param = {
+                "image_key": "data",
+                "input_image": "data",
+                "output_destination":"pyramid",
+                "target":"test",
+                "blocksize":20,
+                "downsample":2,
+                "sigma":4,
+                "radius":3,
+                "max_length":5
+            }
+        
+    return param
+
+
+# Fixtures that write and read full HDF5 pyramids
+SLOW_FIXTURES = {"pyramid_h5", "pyramid_h5_small", "generate_image_pyramid_large"}
+
+def pytest_addoption(parser):
+    parser.addoption("--fast", action="store_true", default=False,
+                     help="skip tests marked slow")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: test reads a generated HDF5 pyramid")
+
+def pytest_collection_modifyitems(config, items):
+    skip_slow = pytest.mark.skip(reason="slow test, run without --fast")
+    for item in items:
+        if SLOW_FIXTURES.intersection(getattr(item, "fixturenames", ())):
+            item.add_marker(pytest.mark.slow)
+            if config.getoption("--fast"):
+                item.add_marker(skip_slow)
@@ -4,7 +4,9 @@ import pytest
 from pathlib import Path
 
 from silt import mainwindow
-from utils import generate_image, generate_pyramid, param_default
+from utils import generate_image, generate_pyramid
+
+TEST_DATA = Path(__file__).resolve().parent / "test_data"
 
 
 class TestMainWindow():
@@ -17,13 +19,11 @@ class TestMainWindow():
 
     @pytest.fixture()
     def template_path(self):
-        file = Path(Path(__file__).resolve().parent) / "test_data" / "test.silttemplate.json"
-        return str(file)
+        return str(TEST_DATA / "test.silttemplate.json")
     
     @pytest.fixture()
     def labels_path(self):
-        file = Path(Path(__file__).resolve().parent) / "test_data" / "test.siltlabels.json"
-        return str(file)
+        return str(TEST_DATA / "test.siltlabels.json")
 
     @pytest.fixture()
     def generated_image_path_default(self, param_default, tmp_path):
@@ -40,10 +40,9 @@ class TestMainWindow():
         target_path = Path(tmp_path) / "example_series"
         target_path.mkdir(parents=True, exist_ok=True)
 
-        for i in range(3):
-            generate_image(target_path / f"{i}.h5", M=200, N=200)
-
-        filenames = [str(p) for p in sorted(target_path.glob("**/*.h5"))]
+        filenames = [str(target_path / f"{i}.h5") for i in range(3)]
+        for filename in filenames:
+            generate_image(filename, M=200, N=200)
 
         return filenames
     
@@ -4,7 +4,17 @@ import h5py
 from pathlib import Path
 
 from silt import pyramid_preprocessing
-from utils import generate_image, generate_pyramid, param_default
+from utils import generate_image, generate_pyramid
+
+# Only read by the tests, so generated once per module
+@pytest.fixture(scope="module")
+def generate_image_pyramid_large(tmp_path_factory, param_default):
+    target_path = tmp_path_factory.mktemp("pyramid_large") / "example.h5"
+    # Smallest size with 3 levels of param_default's max_length
+    generate_image(target_path, M=4100, N=4100)
+    generate_pyramid(target_path, param_default)
+    return target_path
+
 
 class TestPyramidPreprocessing:
 
@@ -19,8 +29,8 @@ class TestPyramidPreprocessing:
     @pytest.fixture()
     def generated_image_path_large(self, tmp_path):
         target_path = Path(tmp_path) / "example.h5"
-        # Generate dummy image
-        generate_image(target_path, M=5000, N=5000)
+        # Generate dummy image, large enough for 3 pyramid levels
+        generate_image(target_path, M=4100, N=4100)
 
         return target_path
     
@@ -45,11 +55,6 @@ class TestPyramidPreprocessing:
     def generate_image_pyramid_default(self, generated_image_path_default, param_default):
         generate_pyramid(generated_image_path_default, param_default)
         return generated_image_path_default
-    
-    @pytest.fixture()
-    def generate_image_pyramid_large(self, generated_image_path_large, param_default):
-        generate_pyramid(generated_image_path_large, param_default)
-        return generated_image_path_large
 
 
 class TestBlockFilter(TestPyramidPreprocessing):
@@ -70,6 +75,22 @@ class TestBlockFilter(TestPyramidPreprocessing):
             assert len == expected_len
             assert width == expected_len
 
+    def test_assert_level_chunked(self, generated_image_path_default, param_default):
+        with h5py.File(generated_image_path_default, "a") as h5_image:
+            h5_image.create_group("pyramid")
+            pyramid_preprocessing.block_filter_to_pyramid(
+                input_image = h5_image[param_default["input_image"]],
+                output_destination = h5_image[param_default["output_destination"]],
+                target = param_default["target"],
+                blocksize = param_default["blocksize"],
+                downsample = param_default["downsample"],
+                sigma = param_default["sigma"],
+                radius = param_default["radius"],
+                chunk_size = 128)
+
+        with h5py.File(generated_image_path_default, "r") as image:
+            assert image["pyramid"][param_default["target"]].chunks == (128, 128)
+
     def test_assert_correct_min_max(self, generated_image_path_default, param_default):
         expected_min = 0
         expected_max = 1000
@@ -114,7 +135,13 @@ class TestGeneratePyramid(TestPyramidPreprocessing):
             assert len(image["pyramid"].items()) == expected
 
     def test_assert_correct_sizes(self, generate_image_pyramid_large):
-        expected=[2500,1250,625]
+        expected=[2050,1025,513]
         with h5py.File(generate_image_pyramid_large, "r") as image:
             for i in range(1, len(image["pyramid"].items())):
                 assert image["pyramid"][str(i)].shape == (expected[i-1], expected[i-1])
+
+    def test_assert_levels_chunked_by_tile(self, generate_image_pyramid_large):
+        # Level z is shown scaled up by 2**z, so a 512 px tile covers 512 / 2**z of its pixels
+        expected = [(256, 256), (128, 128), (64, 64)]
+        with h5py.File(generate_image_pyramid_large, "r") as image:
+            assert [image["pyramid"][str(i)].chunks for i in range(1, 4)] == expected
@@ -1,70 +1,30 @@
 import h5py
 import numpy as np
-import pytest
 
 from silt import pyramid_preprocessing
 from PyQt5.QtWidgets import QGraphicsItem
-
-@pytest.fixture()
-def param_default():
-    param = {
-                "image_key": "data",
-                "input_image": "data",
-                "output_destination":"pyramid",
-                "target":"test",
-                "blocksize":500,
-                "downsample":2,
-                "sigma":4,
-                "radius":3,
-                "max_length":1024
-            }
-        
-    return param
-
-@pytest.fixture()
-def param_small():
-    param = {
-                "image_key": "data",
-                "input_image": "data",
-                "output_destination":"pyramid",
-                "target":"test",
-                "blocksize":20,
-                "downsample":2,
-                "sigma":4,
-                "radius":3,
-                "max_length":5
-            }
-        
-    return param
+from PyQt5.QtCore import QRectF
 
 def generate_image(filename, M = 100, N = 100):
     blocksize = 500
 
     with h5py.File(filename,'w') as h5_file:
 
-        h5_file.create_dataset("data",shape=(M,N),dtype="float64")
-        index = 0
-        total = int(np.ceil(M/blocksize)*np.ceil(N/blocksize))
+        dset = h5_file.create_dataset("data",shape=(M,N),dtype="float32")
+        # Each block is filled with the sum of its top left coordinates.
+        # Write a whole slab of block rows at a time.
+        col_starts = (np.arange(N) // blocksize) * blocksize
         for row in range(0,M,blocksize):
-            for col in range(0,N,blocksize):
-                row_low = row
-                row_hgh = min(row+blocksize,M)
-                col_low = col
-                col_hgh = min(col+blocksize,N)
-                
-                h5_file["data"][row_low:row_hgh,
-                                col_low:col_hgh] = row + col
-                
-                # print(f"{index+1}/{total}")
-                index += 1
+            row_hgh = min(row+blocksize,M)
+            dset[row:row_hgh, :] = np.broadcast_to(row + col_starts, (row_hgh - row, N))
 
 def generate_image_small(filename):
     M=N=20
 
     with h5py.File(filename,'w') as h5_file:
-        h5_file.create_dataset("data",shape=(M,N),dtype="float64")
-        small_array = [[(i+j) for i in range(0,M)] for j in range(0,N)]
-        h5_file["data"][:] = small_array
+        h5_file.create_dataset("data",shape=(M,N),dtype="float32")
+        h5_file["data"][:] = np.add.outer(np.arange(N, dtype="float32"),
+                                          np.arange(M, dtype="float32"))
 
 def generate_pyramid(path, params): 
     pyramid_preprocessing.generate_pyramid(
@@ -87,7 +47,7 @@ class DummyQGraphicsItem(QGraphicsItem):
         super(DummyQGraphicsItem, self).__init__(parent)
     
     def boundingRect(self):
-        pass
+        return QRectF()
 
     def paint(self, painter, option, widget=None):
         pass
\ No newline at end of file
@@ -3,11 +3,34 @@ import numpy as np
 import pytest
 
 from pathlib import Path
-from PyQt5.QtCore import Qt, QPoint, QRectF
-from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt, QEvent, QPoint, QPointF, QRectF
+from PyQt5.QtGui import QColor, QKeyEvent, QTransform
+
+from silt import view_widget, interactive_polygon_item, pyramid_preprocessing
+from silt.view_widget import BaseImageGraphicsItem, ViewWidget
+from utils import generate_image, generate_image_small, generate_pyramid, DummyQGraphicsItem
+
+# The images are only read by the tests, so they are generated once per module
+@pytest.fixture(scope="module")
+def pyramid_h5(param_default, tmp_path_factory):
+    target_path = tmp_path_factory.mktemp("pyramid") / "example.h5"
+    # Generate dummy image, the smallest with 3 pyramid levels
+    generate_image(target_path, M=4100, N=4100)
+
+    generate_pyramid(target_path, param_default)
+
+    return target_path
+
+@pytest.fixture(scope="module")
+def pyramid_h5_small(param_small, tmp_path_factory):
+    target_path = tmp_path_factory.mktemp("pyramid_small") / "example.h5"
+    # Generate dummy image
+    generate_image_small(target_path)
+
+    generate_pyramid(target_path, param_small)
+
+    return target_path
 
-from silt import view_widget, interactive_polygon_item
-from utils import generate_image, generate_image_small, generate_pyramid, DummyQGraphicsItem, param_default, param_small
 
 class TestViewWidgetSetup:
 
@@ -17,26 +40,6 @@ class TestViewWidgetSetup:
         qtbot.addWidget(widget)
         return widget
 
-    @pytest.fixture()
-    def pyramid_h5(self, param_default, tmp_path):
-        target_path = Path(tmp_path) / "example.h5"
-        # Generate dummy image
-        generate_image(target_path, M=5000, N=5000)
-
-        generate_pyramid(target_path, param_default)
-
-        return target_path
-    
-    @pytest.fixture()
-    def pyramid_h5_small(self, param_small, tmp_path):
-        target_path = Path(tmp_path) / "example.h5"
-        # Generate dummy image
-        generate_image_small(target_path)
-
-        generate_pyramid(target_path, param_small)
-
-        return target_path
-    
     @pytest.fixture
     def view_widget_set_image(self, view_widget, pyramid_h5):
         view_widget.setImage(image_file=pyramid_h5,
@@ -48,11 +51,18 @@ class TestViewWidgetSetup:
         return view_widget
 
 class TestViewWidget(TestViewWidgetSetup):
+    def test_init_scene_assert_full_viewport_updates(self, view_widget):
+        """
+        Test that the whole viewport is repainted on changes, instead of the
+        dirty regions of each item.
+        """
+        assert view_widget.viewportUpdateMode() == view_widget.FullViewportUpdate
+
     def test_init_label_items_assert_items_initialized(self, view_widget, mocker):
         """
         Test that label_items are initialized if present.
         """
-        mock = mocker.patch("silt.view_widget.ViewWidget.setLabelItems")
+        mock = mocker.patch.object(ViewWidget, "setLabelItems")
 
         label_items = ["dummy_list"]
 
@@ -70,8 +80,8 @@ class TestViewWidget(TestViewWidgetSetup):
                                     100)
         
         # Avoid interaction with the GraphicsItem
-        mocker = mocker.patch("silt.view_widget.BaseImageGraphicsItem.update_image_window")
-        stub = mocker.stub(name="BaseImageGraphicsItemStub")
+        mocker.patch.object(BaseImageGraphicsItem, "update_image_window")
+        stub = mocker.MagicMock(name="BaseImageGraphicsItemStub")
         view_widget.base_image_item = stub
         view_widget.current_zoom_level = 5
 
@@ -332,7 +342,36 @@ class TestViewWidget(TestViewWidgetSetup):
 
         assert len(view_widget_set_image.label_items) == 2
 
-    def test_get_label_items_assert_correct_items_retrieved(self, 
+    def test_set_label_items_assert_single_scene_update(self,
+                                                        view_widget_set_image,
+                                                        mocker):
+        """
+        Test that loading several label items updates the scene once.
+        """
+        test_label_items = [{'label_item_type':'polygon',
+                             'label_item_vertices':[(i,i),(i,i+1),(i+1,i)],
+                             'label_item_uuid':f'test_{i}'} for i in range(10)]
+        spy = mocker.spy(view_widget_set_image.scene, "update")
+
+        view_widget_set_image.setLabelItems(test_label_items)
+
+        assert spy.call_count == 1
+        assert not view_widget_set_image._batch_mode
+
+    def test_key_press_assert_image_updates_coalesced(self, view_widget, qtbot, mocker):
+        """
+        Test that a burst of arrow key presses updates the image window once.
+        """
+        view_widget.base_image_item = mocker.Mock()
+        key_event = QKeyEvent(QEvent.KeyPress, Qt.Key_Right, Qt.NoModifier)
+
+        for _ in range(5):
+            view_widget.keyPressEvent(key_event)
+
+        qtbot.waitUntil(lambda: not view_widget.update_timer.isActive())
+        view_widget.base_image_item.update_image_window.assert_called_once()
+
+    def test_get_label_items_assert_correct_items_retrieved(self,
                                                             view_widget_set_image):
         """
         Test that the expected items are returned correctly.
@@ -362,6 +401,29 @@ class TestViewWidget(TestViewWidgetSetup):
 
         assert items == expected_items
         
+    def test_get_label_items_soa_assert_correct_items_retrieved(self, 
+                                                                view_widget_set_image):
+        """
+        Test that the per-field lists are returned in item order.
+        """
+        test_label_items = [{'label_item_type':'polygon',
+                             'label_item_vertices':[(0,0),(0,1),(1,0)],
+                             'label_item_uuid':'test_1'},
+                             {'label_item_type':'polygon',
+                             'label_item_vertices':[(1,1),(1,2),(2,1)],
+                             'label_item_uuid':'test_2'}]
+        
+        view_widget_set_image.setLabelItems(test_label_items)
+
+        soa = view_widget_set_image.getLabelItemsSoA(get_label_item_pixels=True)
+
+        assert soa['types'] == ['polygon', 'polygon']
+        assert soa['uuids'] == ['test_1', 'test_2']
+        assert soa['vertices'] == [[(0.0, 0.0), (0.0, 1.0), (1.0, 0.0), (0.0, 0.0)],
+                                   [(1.0, 1.0), (1.0, 2.0), (2.0, 1.0), (1.0, 1.0)]]
+        assert soa['pixels'] == [[(0, 0)], [(1, 1)]]
+        assert soa['bounding_rects'] is None
+
     def test_get_label_item_pixels_assert_correct_values(self, 
                                                          view_widget_set_image):
         """
@@ -383,7 +445,25 @@ class TestViewWidget(TestViewWidgetSetup):
 
         assert label_item_pixels == expected_label_item_pixels
 
-    def test_add_label_graphics_item_assert_item_added(self, 
+    def test_polygon_covered_pixels_assert_matches_contains_point(self):
+        """
+        Test that the vectorized rasterization matches
+        QPolygonF.containsPoint on random polygons.
+        """
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            vertices = rng.uniform(-5, 25, size=(rng.integers(3, 9), 2))
+            vertices[rng.integers(len(vertices))] = np.round(vertices[0])
+            poly = view_widget.polygon_from_points(vertices)
+
+            expected = [(x, y) for y in range(-6, 27) for x in range(-6, 27)
+                        if poly.containsPoint(QPointF(x, y), Qt.WindingFill)]
+            pixels = interactive_polygon_item.polygon_covered_pixels(
+                vertices, -6, 27, -6, 27)
+
+            assert pixels == expected
+
+    def test_add_label_graphics_item_assert_item_added(self,
                                                        view_widget_set_image):
         """
         Test that the graphics item is correctly added.
@@ -459,6 +539,19 @@ class TestViewWidget(TestViewWidgetSetup):
 
         assert item.uuid == uuid
 
+    def test_polygon_from_points_assert_correct_values(self):
+        """
+        Test that the polygon is built correctly from a list or an array of points.
+        """
+        pts = [(0,1),(2.5,3),(4,5.5)]
+
+        for poly in (view_widget.polygon_from_points(pts),
+                     view_widget.polygon_from_points(np.array(pts))):
+            assert poly.count() == 3
+            assert [(poly.value(i).x(), poly.value(i).y()) for i in range(3)] == pts
+
+        assert view_widget.polygon_from_points([]).count() == 0
+
     def test_remove_item_assert_correct_item_removed(self, 
                                                      view_widget_set_image):
         """
@@ -483,6 +576,123 @@ class TestViewWidget(TestViewWidgetSetup):
         assert removed_item.polygon().value(1).x() == pts_1[1][0]
         assert removed_item.polygon().value(1).y() == pts_1[1][1]
 
+    def test_selected_label_item_indices_assert_tracks_selection(self,
+                                                                view_widget_set_image):
+        """
+        Test that the selected indices follow selection changes and item removal.
+        """
+        for pts in ([(0,1),(1,0),(0,0)], [(1,2),(2,1),(1,1)], [(2,3),(3,2),(2,2)]):
+            view_widget_set_image.addPolygon(pts)
+
+        assert view_widget_set_image._selectedLabelItemIndices() == []
+
+        view_widget_set_image.setLabelItemSelected(2)
+        assert view_widget_set_image._selectedLabelItemIndices() == [2]
+
+        view_widget_set_image.removeItem(0)
+        assert view_widget_set_image._selectedLabelItemIndices() == [1]
+
+        view_widget_set_image.clearLabelItemSelection()
+        assert view_widget_set_image._selectedLabelItemIndices() == []
+
+    def test_refine_poly_assert_polygon_replaced(self,
+                                                  view_widget_set_image,
+                                                  mocker):
+        """
+        Test that the selected polygon is passed to the assist in chip coordinates,
+        and replaced by the refined polygon in scene coordinates.
+        """
+        class ShiftAssist:
+            def refine_polygon(self, image_chip, vertices, alg_options):
+                self.vertices = np.array(vertices)
+                return [(pt[0] + 1, pt[1] + 2) for pt in vertices]
+
+        assist = ShiftAssist()
+        mocker.patch("silt.view_widget.ViewWidget.setPolyAssistMethod")
+        mocker.patch("silt.view_widget.poly_assistant", assist, create=True)
+
+        view_widget_set_image.addPolygon([(10,10),(10,20),(20,10)], uuid="other")
+        view_widget_set_image.addPolygon([(30,30),(30,40),(40,30)], uuid="refined")
+        view_widget_set_image.setLabelItemSelected(1)
+
+        view_widget_set_image.refinePoly()
+
+        assert len(view_widget_set_image.label_items) == 2
+        # Chip coordinates depend on the viewport, but the shape must be preserved
+        np.testing.assert_array_equal(assist.vertices - assist.vertices[0],
+                                      [(0,0),(0,10),(10,0),(0,0)])
+        assert view_widget_set_image.label_items[1].getVertices() == [(31.0,32.0),(31.0,42.0),(41.0,32.0),(31.0,32.0)]
+
+    def test_refine_poly_assert_chip_origin_clipped_to_image(self,
+                                                             view_widget_set_image,
+                                                             mocker):
+        """
+        Test that when the viewport reaches into the scene margin, the vertices
+        are passed relative to the chip that was read, which starts at the image
+        corner, and the refined polygon is put back in place. The chip is read
+        into the same buffer on the next refinement.
+        """
+        class RecordingAssist:
+            def refine_polygon(self, image_chip, vertices, alg_options):
+                self.image_chip = image_chip
+                self.vertices = np.array(vertices)
+                return vertices
+
+        assist = RecordingAssist()
+        mocker.patch("silt.view_widget.ViewWidget.setPolyAssistMethod")
+        mocker.patch("silt.view_widget.poly_assistant", assist, create=True)
+
+        widget = view_widget_set_image
+        widget.resize(200, 200)
+        widget.scale(4, 4)
+        widget.horizontalScrollBar().setValue(widget.horizontalScrollBar().minimum())
+        widget.verticalScrollBar().setValue(widget.verticalScrollBar().minimum())
+        viewport = widget.base_grid.mapRectFromScene(widget.mapToScene(widget.viewport().geometry()).boundingRect())
+        assert viewport.left() < 0 and viewport.top() < 0
+
+        widget.addPolygon([(30,30),(30,40),(40,30)], uuid="refined")
+        widget.setLabelItemSelected(0)
+        vertices = widget.label_items[0].getVertices()
+        grid_vertices = [widget.base_grid.mapFromScene(QPointF(*pt)) for pt in vertices]
+
+        widget.refinePoly()
+
+        np.testing.assert_allclose(assist.vertices, [(pt.x(), pt.y()) for pt in grid_vertices])
+        with h5py.File(widget.base_image_item.image_file, "r") as image_data:
+            height, width = assist.image_chip.shape[:2]
+            np.testing.assert_array_equal(assist.image_chip, image_data["data"][:height, :width])
+        np.testing.assert_allclose(widget.label_items[0].getVertices(), vertices)
+
+        chip = assist.image_chip
+        widget.setLabelItemSelected(0)
+        widget.refinePoly()
+        assert assist.image_chip is chip
+
+    def test_get_vertex_assert_matches_get_vertices(self, view_widget_set_image):
+        """
+        Test that a single vertex is read in the same coordinates as getVertices()
+        """
+        view_widget_set_image.addPolygon([(10,10),(10,20),(20,10)], uuid="poly")
+        item = view_widget_set_image.label_items[0]
+        item.setPos(5, 7)
+
+        vertices = item.getVertices()
+        assert [item.getVertex(i) for i in range(3)] == vertices[:3]
+
+    def test_get_bounding_rect_assert_rounds_outward(self, view_widget_set_image):
+        """
+        Test that the bounding rect corners are whole pixels covering the
+        moved polygon.
+        """
+        view_widget_set_image.addPolygon([(10.5,10.2),(10.5,20.7),(20.3,10.2)], uuid="poly")
+        item = view_widget_set_image.label_items[0]
+        item.setPos(5, 7)
+
+        corners = item.getBoundingRect()
+
+        assert corners == [(15, 17), (26, 17), (26, 28), (15, 28)]
+        assert all(type(c) is int for corner in corners for c in corner)
+
     def test_update_vertex_diameters_assert_correct_diameters(self, 
                                                               view_widget_set_image):
         """
@@ -559,6 +769,229 @@ class TestImageGraphicsItem(TestViewWidgetSetup):
         assert baseImageGraphicsItemWidget.current_coordinates == new_coordinates
         assert baseImageGraphicsItemWidget.current_zoom_level == 1
 
+    def test_update_image_window_assert_revisit_uses_rendered_cache(self,
+                                                                    baseImageGraphicsItemWidgetSmallImage,
+                                                                    mocker):
+        """
+        Test that returning to a recently rendered view reuses its rendering,
+        and that the next crop computed afterwards is still correct.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        widget.processing_tile_size = 3
+        view_a = QRectF(0,0,2,2)
+        view_b = QRectF(4,4,4,4)
+
+        widget.update_image_window(view_a, 0)
+        pixmaps_a = widget.pixmaps
+        crop_a = widget.current_crop
+        widget.update_image_window(view_b, 0)
+        crop_b = widget.current_crop.copy()
+
+        spy = mocker.spy(widget, "_calculate_crop")
+        widget.update_image_window(view_a, 0)
+
+        assert spy.call_count == 0
+        assert widget.current_crop is crop_a
+        assert widget.pixmaps is pixmaps_a
+        assert widget._display[0][2] is pixmaps_a[0][0]
+
+        # The tile cache still holds the tiles of view_b
+        crop = widget._calculate_crop(new_coordinates=view_b,
+                                      new_zoom_level=0,
+                                      shadow=widget.current_shadow,
+                                      mid=widget.current_mid,
+                                      highlight=widget.current_highlight,
+                                      autoset_levels=False)
+        np.testing.assert_array_equal(crop, crop_b)
+
+    def test_init_assert_misaligned_chunks_warned(self, qtbot, tmp_path, param_small, caplog):
+        """
+        Test that pyramid levels chunked across the processing tiles are reported.
+        """
+        target_path = Path(tmp_path) / "example.h5"
+        generate_image(target_path, M=1100, N=1100)
+        # Levels 1 and 2 are chunked by 150 and 75 px, across their 256 and 128 px tiles
+        pyramid_preprocessing.generate_pyramid(file_path=target_path,
+                                               image_key=param_small["image_key"],
+                                               blocksize=500,
+                                               max_length=512,
+                                               chunk_size=300)
+
+        widget = view_widget.BaseImageGraphicsItem(image_file=target_path,
+                                                   original_image_key=param_small["image_key"],
+                                                   shadow=0,
+                                                   mid=10,
+                                                   highlight=20)
+        widget.close()
+
+        assert "Pyramid chunks are not aligned" in caplog.text
+
+    def test_init_assert_uniform_chunks_warned(self, qtbot, tmp_path, mocker, caplog):
+        """
+        Test that pyramid levels all chunked by the processing tile size are reported,
+        because the tiles read from levels above 0 are smaller than that.
+        """
+        target_path = Path(tmp_path) / "example.h5"
+        generate_image(target_path, M=1100, N=1100)
+        block_filter = pyramid_preprocessing.block_filter_to_pyramid
+        mocker.patch.object(pyramid_preprocessing, "block_filter_to_pyramid",
+                            side_effect=lambda **kwargs: block_filter(**{**kwargs, "chunk_size": 512}))
+        pyramid_preprocessing.generate_pyramid(file_path=target_path, image_key="data", 
+                                               blocksize=500, max_length=512)
+
+        widget = view_widget.BaseImageGraphicsItem(image_file=target_path,
+                                                   original_image_key="data",
+                                                   shadow=0,
+                                                   mid=10,
+                                                   highlight=20)
+        widget.close()
+
+        assert "1: (512, 512) for 256 px tiles" in caplog.text
+        assert "2: (275, 275) for 128 px tiles" in caplog.text
+
+    def test_init_assert_aligned_chunks_not_warned(self, baseImageGraphicsItemWidget, caplog):
+        """
+        Test that a pyramid generated with the default chunks isn't reported.
+        """
+        baseImageGraphicsItemWidget._check_pyramid_chunks()
+
+        assert "Pyramid chunks are not aligned" not in caplog.text
+
+    def test_no_pyramid_assert_runtime_pyramid_built(self, qtbot, tmp_path, monkeypatch):
+        """
+        Test that an image without a pyramid is decimated into an in-memory pyramid,
+        and that crops of its levels are read from it.
+        """
+        target_path = Path(tmp_path) / "example.h5"
+        generate_image(target_path, M=100, N=90)
+        pyramid_preprocessing.generate_pyramid(file_path=target_path, image_key="data", no_pyramid=True)
+        # 25 x 23 float32 pixels is the first level under the budget
+        monkeypatch.setattr(view_widget, "RUNTIME_PYRAMID_BYTES", 5000)
+
+        widget = view_widget.BaseImageGraphicsItem(image_file=target_path,
+                                                   original_image_key="data",
+                                                   shadow=0,
+                                                   mid=10,
+                                                   highlight=20,
+                                                   no_pyramid=True)
+
+        assert widget.get_max_zoom() == 2
+        assert widget.processing_tile_size == 512
+        with h5py.File(target_path, "r") as h5_image:
+            original = h5_image["data"][:]
+        np.testing.assert_array_equal(widget._pyramid_levels[1][:], original[::2, ::2])
+        np.testing.assert_array_equal(widget._pyramid_levels[2][:], original[::4, ::4])
+
+        widget.update_image_window(QRectF(0,0,90,100), 2)
+        assert widget.current_crop.shape[0] == 25
+        widget.close()
+
+    def test_update_image_window_assert_levels_change_reuses_raw_crop(self,
+                                                                      baseImageGraphicsItemWidgetSmallImage,
+                                                                      mocker):
+        """
+        Test that new image levels are applied to the stitched crop already in
+        memory, and give the same image as a crop stitched anew.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        widget.processing_tile_size = 3
+        widget.update_image_window(QRectF(4,4,4,4), 0)
+        raw_crop = widget.raw_crop.copy()
+
+        spy = mocker.spy(widget, "_collect_processing_tiles")
+        widget.update_image_window(new_shadow=5, new_mid=12, new_highlight=25)
+
+        assert spy.call_count == 0
+        np.testing.assert_array_equal(widget.raw_crop, raw_crop)
+        expected_crop = widget._compute_new_image_levels(raw_crop, 5, 12, 25)
+        np.testing.assert_array_equal(widget.current_crop, expected_crop)
+
+    def test_update_image_window_assert_unchanged_view_not_rerendered(self,
+                                                                       baseImageGraphicsItemWidgetSmallImage,
+                                                                       mocker):
+        """
+        Test that an update with the same coordinates, and nothing else new, is skipped.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        widget.update_image_window(QRectF(0,0,2,2), 0)
+
+        spy = mocker.spy(widget, "_render_crop")
+        widget.update_image_window(QRectF(0,0,2,2+1e-9))
+        assert spy.call_count == 0
+
+        widget.update_image_window(QRectF(0,0,2,2), new_shadow=1)
+        assert spy.call_count == 1
+
+    def test_update_image_window_assert_rendered_in_background(self,
+                                                              baseImageGraphicsItemWidgetSmallImage,
+                                                              qtbot):
+        """
+        Test that a crop rendered in the background is displayed once done,
+        and only for the newest request. The item is only updated on the UI thread.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        widget.processing_tile_size = 3
+        widget.update_image_window(QRectF(0,0,2,2), 0)
+        widget.render_in_background = True
+
+        widget.update_image_window(QRectF(9,9,2,2))
+        widget.update_image_window(QRectF(4,4,4,4))
+        widget._render_pool.waitForDone()
+        assert set(widget.current_crop_list.keys()) == {(0,0)}
+        qtbot.waitUntil(lambda: widget._display[0][:2] == (3, 3))
+
+        assert set(widget.current_crop_list.keys()) == {(1,1), (1,2), (2,1), (2,2)}
+        assert len(widget._display) == 1
+        widget.close()
+
+    def test_bounding_rect_assert_covers_original_image(self,baseImageGraphicsItemWidgetSmallImage):
+        """
+        Test that the bounding rect covers the full resolution image.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        assert widget.boundingRect() == QRectF(0, 0, widget.original_image_length,
+                                               widget.original_image_height)
+
+    def test_make_display_tiles_assert_tiles_are_views(self,baseImageGraphicsItemWidgetSmallImage):
+        """
+        Test that display tiles cover the image without copying it.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        widget.display_tile_size = 4
+        image = np.arange(10*9, dtype=np.uint8).reshape(10, 9)
+
+        tiles = widget._make_display_tiles(image)
+
+        assert (widget.num_tiles_h, widget.num_tiles_w) == (3, 3)
+        assert tiles[2][2].shape == (2, 1)
+        assert all(np.shares_memory(tile, image) for row in tiles for tile in row)
+        np.testing.assert_array_equal(np.block(tiles), image)
+
+        widget.display_tile_size = 10
+        tiles = widget._make_display_tiles(image)
+        assert (widget.num_tiles_h, widget.num_tiles_w) == (1, 1)
+        assert tiles[0][0] is image
+
+    def test_set_pixmaps_assert_strided_tiles_displayed(self,baseImageGraphicsItemWidgetSmallImage):
+        """
+        Test that pixmaps built from strided tile views hold the tile pixels.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        widget.display_tile_size = 4
+        gray = np.arange(10*9, dtype=np.uint8).reshape(10, 9)
+        color = np.arange(10*9*3, dtype=np.uint8).reshape(10, 9, 3)
+
+        widget._set_pixmaps(widget._make_display_tiles(gray))
+        image = widget.pixmaps[1][1].toImage()
+        assert (image.width(), image.height()) == (4, 4)
+        assert [image.pixelColor(x, 2).red() for x in range(4)] == list(gray[6, 4:8])
+
+        widget._set_pixmaps(widget._make_display_tiles(color))
+        image = widget.pixmaps[2][1].toImage()
+        assert (image.width(), image.height()) == (4, 2)
+        pixel = image.pixelColor(3, 1)
+        assert [pixel.red(), pixel.green(), pixel.blue()] == list(color[9, 7])
+
     def test_compute_new_image_levels_assert_correct_image_levels(self,
                                                                   baseImageGraphicsItemWidget,
                                                                   mocker):
@@ -599,6 +1032,55 @@ class TestImageGraphicsItem(TestViewWidgetSetup):
 
         np.testing.assert_array_equal(result_image, expected_image)
 
+    def test_compute_new_image_levels_assert_lut_matches_direct(self,
+                                                                baseImageGraphicsItemWidget,
+                                                                monkeypatch):
+        """
+        Test that 16 bit images, looked up through the levels table in
+        row bands, get the same levels as when computed directly
+        """
+        monkeypatch.setattr(view_widget, "LEVELS_BAND_PIXELS", 5000)
+        monkeypatch.setattr(view_widget, "LEVELS_THREADS", 4)
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 4000, size=(300, 300), dtype=np.uint16)
+        shadow = 500
+        mid = 1200
+        highlight = 3000
+
+        result_image = baseImageGraphicsItemWidget._compute_new_image_levels(image=image,
+                                                             shadow=shadow,
+                                                             mid=mid,
+                                                             highlight=highlight)
+        gamma_correct = baseImageGraphicsItemWidget._gamma_exponent(
+            (mid - float(image.min())) / float(image.max() - image.min()))
+        expected_image = baseImageGraphicsItemWidget._levels_to_8_bit(image,
+                                                                      float(image.min()),
+                                                                      float(image.max()),
+                                                                      shadow,
+                                                                      highlight,
+                                                                      gamma_correct)
+
+        assert baseImageGraphicsItemWidget._levels_lut.shape == (2**16,)
+        np.testing.assert_array_equal(result_image[:, :300], expected_image)
+
+    def test_levels_to_8_bit_assert_bands_match_whole_image(self,
+                                                            baseImageGraphicsItemWidget,
+                                                            monkeypatch):
+        """
+        Test that computing the levels in parallel row bands gives the same
+        image as computing them all at once
+        """
+        rng = np.random.default_rng(0)
+        image = rng.uniform(0, 4000, size=(101, 50))
+        args = (image, float(image.min()), float(image.max()), 500, 3000, 0.5)
+
+        expected_image = baseImageGraphicsItemWidget._levels_to_8_bit(*args)
+        monkeypatch.setattr(view_widget, "LEVELS_BAND_PIXELS", 500)
+        monkeypatch.setattr(view_widget, "LEVELS_THREADS", 4)
+        result_image = baseImageGraphicsItemWidget._levels_to_8_bit(*args)
+
+        np.testing.assert_array_equal(result_image, expected_image)
+
     def test_auto_set_image_levels_in_bounds_assert_correct_values(self, 
                                                                    baseImageGraphicsItemWidget):
         """
@@ -612,6 +1094,19 @@ class TestImageGraphicsItem(TestViewWidgetSetup):
         assert mid == 10
         assert highlight == 20
 
+    def test_auto_set_image_levels_in_bounds_assert_large_crop_subsampled(self,
+                                                                          baseImageGraphicsItemWidget):
+        """
+        Test that the levels of a large crop are taken from an even subsample
+        """
+        image = np.add.outer(np.arange(1000), np.arange(1000))
+
+        (shadow, mid, highlight) = baseImageGraphicsItemWidget._calculate_auto_image_levels(image)
+
+        assert shadow == 0
+        assert highlight == 1992
+        assert mid == 996
+
     def test_get_max_zoom_assert_correct(self,
                                          baseImageGraphicsItemWidget):
         """
@@ -752,40 +1247,225 @@ class TestImageGraphicsItem(TestViewWidgetSetup):
         assert crop.shape == (6,8)
         np.testing.assert_array_equal(crop, expected_crop)
 
+    def test_update_image_window_assert_neighbor_tiles_prefetched(self,
+                                                                 baseImageGraphicsItemWidgetSmallImage,
+                                                                 qtbot):
+        """
+        Test that the tiles bordering the crop are read in the background, and
+        used when the viewport moves onto them.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        widget.processing_tile_size = 3
+
+        widget.update_image_window(new_coordinates=QRectF(5,5,2,2), new_zoom_level=0)
+        assert widget._prefetch_request is None
+        widget._prefetch_pool.waitForDone()
+
+        # The tiles are stored once their signals reach the UI thread
+        expected_keys = {("/data", x, y) for x in range(0, 4) for y in range(0, 4)
+                         if not (1 <= x <= 2 and 1 <= y <= 2)}
+        qtbot.waitUntil(lambda: set(widget.prefetched_tiles.keys()) == expected_keys)
+        np.testing.assert_array_equal(widget.prefetched_tiles[("/data", 3, 0)],
+                                      [[9., 10., 11.], [10., 11., 12.], [11., 12., 13.]])
+
+        with h5py.File(widget.image_file, "r") as image_data:
+            pyramid_level = image_data[widget.original_image_key]
+            crop = widget._collect_processing_tiles(pyramid_level, 3, 3, 0, 0)
+
+        assert ("/data", 3, 0) not in widget.prefetched_tiles
+        np.testing.assert_array_equal(crop, [[9., 10., 11.], [10., 11., 12.], [11., 12., 13.]])
+
+        widget.stop_prefetch()
+        assert widget.prefetched_tiles == {}
+
+    def test_calculate_crop_assert_autoset_levels_from_viewport(self,
+                                                               baseImageGraphicsItemWidgetSmallImage,
+                                                               mocker):
+        """
+        Test that the automatic levels are computed on the viewport part of the crop.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        widget.processing_tile_size = 3
+        spy = mocker.spy(widget, "_calculate_auto_image_levels")
+
+        widget._calculate_crop(new_coordinates=QRectF(4,2,3,4),
+                               new_zoom_level=0,
+                               shadow=widget.current_shadow,
+                               mid=widget.current_mid,
+                               highlight=widget.current_highlight,
+                               autoset_levels=True)
+
+        with h5py.File(widget.image_file, "r") as image_data:
+            expected_window = image_data[widget.original_image_key][2:6, 4:7]
+
+        np.testing.assert_array_equal(spy.call_args.args[0], expected_window)
+
+    def test_collect_processing_tiles_assert_extremes_tracked(self,
+                                                             baseImageGraphicsItemWidgetSmallImage,
+                                                             mocker):
+        """
+        Test that the min and max of the crop are kept per tile, and that
+        cached tiles aren't scanned again.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        widget.processing_tile_size = 3
+        pyramid_level = widget._pyramid_levels[-1]
+
+        crop = widget._collect_processing_tiles(pyramid_level, 0, 1, 0, 1)
+        assert widget.current_crop_extremes == (crop.min(), crop.max())
+        assert set(widget.tile_extremes.keys()) == {(0,0), (0,1), (1,0), (1,1)}
+
+        widget.tile_extremes[(1,1)] = (-1.0, 100.0)
+        crop = widget._collect_processing_tiles(pyramid_level, 0, 1, 0, 1)
+        assert widget.current_crop_extremes == (-1.0, 100.0)
+
+    def test_collect_processing_tiles_assert_tiles_are_views_of_crop(self,
+                                                                     baseImageGraphicsItemWidgetSmallImage):
+        """
+        Test that the tiles are read into the stitched crop and kept as views of it,
+        also when they are reused for the next crop.
+        """
+        widget = baseImageGraphicsItemWidgetSmallImage
+        widget.processing_tile_size = 3
+        pyramid_level = widget._pyramid_levels[-1]
+
+        widget._collect_processing_tiles(pyramid_level, 0, 1, 0, 1)
+        crop = widget._collect_processing_tiles(pyramid_level, 1, 2, 0, 1)
+
+        assert crop is widget.raw_crop
+        for tile in widget.current_crop_list.values():
+            assert tile.base is crop
+        np.testing.assert_array_equal(widget.current_crop_list[(1,1)], crop[3:6, 0:3])
+        np.testing.assert_array_equal(crop, np.add.outer(np.arange(6), np.arange(3, 9)))
+
+    def test_set_image_file_assert_levels_cached(self, baseImageGraphicsItemWidget):
+        """
+        Test that the image file is kept open with its pyramid levels,
+        until closed.
+        """
+        widget = baseImageGraphicsItemWidget
+        with h5py.File(widget.image_file, "r") as image_data:
+            expected_levels = {-1: image_data[widget.original_image_key].shape}
+            for key, dataset in image_data["pyramid"].items():
+                expected_levels[int(key)] = dataset.shape
+
+        assert widget._level_shapes == expected_levels
+        assert set(widget._pyramid_levels.keys()) == set(expected_levels.keys())
+        assert widget._pyramid_levels[-1].name == "/" + widget.original_image_key
+
+        h5 = widget._h5
+        widget.close()
+        assert widget._h5 is None
+        assert not h5.id.valid
+
+    @pytest.mark.skipif(not view_widget.H5_READ_CHUNKS_INTO_BUFFER,
+                        reason="h5py can't read raw chunks into a buffer")
+    def test_calculate_crop_assert_chunks_read_directly(self, baseImageGraphicsItemWidget, mocker):
+        """
+        Test that the tiles of a generated pyramid level, each exactly one of
+        its chunks, are read as raw chunks, and that the crop matches the level.
+        """
+        widget = baseImageGraphicsItemWidget
+        level = widget._pyramid_levels[1]
+        assert level.name in widget._raw_chunk_levels
+        read_spy = mocker.spy(level, "read_direct")
+        chunk_spy = mocker.spy(widget, "_read_chunk_direct")
+
+        # Scene tiles 1 and 2 of level 1, shown at scale 2, are its pixels 256 to 768
+        widget._calculate_crop(new_coordinates=QRectF(512, 512, 1000, 1000),
+                               new_zoom_level=1,
+                               shadow=widget.current_shadow,
+                               mid=widget.current_mid,
+                               highlight=widget.current_highlight,
+                               autoset_levels=False,
+                               scene_to_item=QTransform.fromScale(0.5, 0.5))
+
+        np.testing.assert_array_equal(widget.raw_crop, level[256:768, 256:768])
+        assert chunk_spy.call_count == 4
+        assert read_spy.call_count == 0
+        widget.close()
+
+    def test_collect_processing_tiles_assert_chunks_read_regularly_without_support(self, qtbot, tmp_path,
+                                                                                  mocker, monkeypatch):
+        """
+        Test that chunks aren't read raw if h5py can't read them into a buffer,
+        and that unwritten chunks are read as the fill value.
+        """
+        monkeypatch.setattr(view_widget, "H5_READ_CHUNKS_INTO_BUFFER", False)
+        target_path = Path(tmp_path) / "example.h5"
+        with h5py.File(target_path, "w") as h5_file:
+            h5_file.create_dataset("data", shape=(8, 8), dtype=np.float32, chunks=(4,4))
+            h5_file["data"][:4, :4] = 1
+            h5_file.attrs["max_level"] = 0
+        widget = view_widget.BaseImageGraphicsItem(image_file=target_path,
+                                                   original_image_key="data",
+                                                   shadow=0,
+                                                   mid=10,
+                                                   highlight=20)
+        widget.processing_tile_size = 4
+        spy = mocker.spy(widget._pyramid_levels[-1], "read_direct")
+
+        crop = widget._collect_processing_tiles(widget._pyramid_levels[-1], 0, 1, 0, 1)
+
+        assert widget._raw_chunk_levels == set()
+        assert spy.call_count == 4
+        assert crop.sum() == 16
+        widget.close()
+
     def test_collect_processing_tiles_assert_correct_tiles_1(self, baseImageGraphicsItemWidgetSmallImage):
         baseImageGraphicsItemWidgetSmallImage.processing_tile_size = 3
-        with h5py.File(baseImageGraphicsItemWidgetSmallImage.image_file, "r") as image_data:
-            pyramid_level = image_data[baseImageGraphicsItemWidgetSmallImage.original_image_key]
-            crop = baseImageGraphicsItemWidgetSmallImage._collect_processing_tiles(pyramid_level, 0, 1, 0, 1)
-
-        expected_crop = [[ 0.,  1.,  2.,  3.,  4.,  5.],
-                        [ 1.,  2.,  3.,  4.,  5.,  6.],
-                        [ 2.,  3.,  4.,  5.,  6.,  7.],
-                        [ 3.,  4.,  5.,  6.,  7.,  8.],
-                        [ 4.,  5.,  6.,  7.,  8.,  9.],
-                        [ 5.,  6.,  7.,  8.,  9., 10.]]
+        # Read through the dataset the widget already holds open
+        pyramid_level = baseImageGraphicsItemWidgetSmallImage._pyramid_levels[-1]
+        crop = baseImageGraphicsItemWidgetSmallImage._collect_processing_tiles(pyramid_level, 0, 1, 0, 1)
+
+        # The small image's value is the sum of its coordinates
+        expected_crop = np.add.outer(np.arange(6), np.arange(6)).astype(pyramid_level.dtype)
         
         assert crop.shape == (6,6)
+        assert crop.dtype == expected_crop.dtype
         np.testing.assert_array_equal(crop, expected_crop)
     
     def test_collect_processing_tiles_assert_correct_tiles_2(self, baseImageGraphicsItemWidgetSmallImage):
         baseImageGraphicsItemWidgetSmallImage.processing_tile_size = 2
-        with h5py.File(baseImageGraphicsItemWidgetSmallImage.image_file, "r") as image_data:
-            pyramid_level = image_data[baseImageGraphicsItemWidgetSmallImage.original_image_key]
-            crop = baseImageGraphicsItemWidgetSmallImage._collect_processing_tiles(pyramid_level, 2, 5, 3, 6)
-
-        expected_crop = [[10., 11., 12., 13., 14., 15., 16., 17.,],
-                        [11., 12., 13., 14., 15., 16., 17., 18.,],
-                        [12., 13., 14., 15., 16., 17., 18., 19.,],
-                        [13., 14., 15., 16., 17., 18., 19., 20.,],
-                        [14., 15., 16., 17., 18., 19., 20., 21.,],
-                        [15., 16., 17., 18., 19., 20., 21., 22.,],
-                        [16., 17., 18., 19., 20., 21., 22., 23.,],
-                        [17., 18., 19., 20., 21., 22., 23., 24.,]]
+        # Read through the dataset the widget already holds open
+        pyramid_level = baseImageGraphicsItemWidgetSmallImage._pyramid_levels[-1]
+        crop = baseImageGraphicsItemWidgetSmallImage._collect_processing_tiles(pyramid_level, 2, 5, 3, 6)
+
+        expected_crop = np.add.outer(np.arange(4, 12), np.arange(6, 14)).astype(pyramid_level.dtype)
         
         assert crop.shape == (8,8)
+        assert crop.dtype == expected_crop.dtype
         np.testing.assert_array_equal(crop, expected_crop)
 
+    def test_get_image_chip_assert_correct_values(self, baseImageGraphicsItemWidgetSmallImage):
+        """
+        Test that the chip is read correctly, straight into a matching array.
+        """
+        out = np.zeros((2, 4), dtype="float32")
+
+        chip = baseImageGraphicsItemWidgetSmallImage.get_image_chip(QRectF(2, 3, 4, 2), out=out)
+
+        expected_chip = [[5., 6., 7., 8.],
+                         [6., 7., 8., 9.]]
+
+        assert chip is out
+        np.testing.assert_array_equal(chip, expected_chip)
+
+    def test_get_image_chip_assert_clipped_to_image(self, baseImageGraphicsItemWidgetSmallImage):
+        """
+        Test that a chip extending past the image is clipped, and that an array
+        which doesn't match the chip is replaced by a contiguous one.
+        """
+        out = np.zeros((10, 10), dtype="float32")
+
+        chip = baseImageGraphicsItemWidgetSmallImage.get_image_chip(QRectF(-5, 18, 10, 10), out=out)
+
+        assert chip.shape == (2, 5)
+        assert chip.base is None
+        assert chip.flags.c_contiguous
+        np.testing.assert_array_equal(chip, [[18., 19., 20., 21., 22.],
+                                             [19., 20., 21., 22., 23.]])
+
     def test_gamma_correct_assert_correct_values(self, baseImageGraphicsItemWidget):
         """
         Test that an input image is gamma corrected correctly.
@@ -801,6 +1481,25 @@ class TestImageGraphicsItem(TestViewWidgetSetup):
 
         np.testing.assert_array_equal(np.round(result_image, decimals=3), expected_image)
 
+    @pytest.mark.parametrize("mid, expected_exponent",
+                             [(0.5, None),
+                              (0.5 + 1e-12, None),
+                              (0.75, 2.0),
+                              (0.25, 1/5.5)])
+    def test_gamma_exponent_assert_centered_midtone_skipped(self, 
+                                                            baseImageGraphicsItemWidget,
+                                                            mid,
+                                                            expected_exponent):
+        """
+        Test that midtones centered within rounding need no gamma correction.
+        """
+        exponent = baseImageGraphicsItemWidget._gamma_exponent(mid)
+
+        if expected_exponent is None:
+            assert exponent is None
+        else:
+            assert exponent == pytest.approx(expected_exponent)
+
     def test_get_pad_assert_correct_values_1(self, baseImageGraphicsItemWidget):
         """
         Test that the padding is correct.
@@ -832,6 +1531,14 @@ class TestImageGraphicsItem(TestViewWidgetSetup):
 
         assert error.type == SystemExit
 
+    def test_get_pad_width_assert_correct_values(self, baseImageGraphicsItemWidget):
+        """
+        Test that the pad width 32-bit aligns each row width.
+        """
+        widths = [baseImageGraphicsItemWidget._get_pad_width(w) for w in range(1, 9)]
+
+        assert widths == [3, 2, 1, 0, 3, 2, 1, 0]
+
     def test_rescale_to_8bit_assert_correct_values(self, baseImageGraphicsItemWidget):
         """
         Test that the image is rescaled correctly.
@@ -840,6 +1547,7 @@ class TestImageGraphicsItem(TestViewWidgetSetup):
 
         result_image = baseImageGraphicsItemWidget._rescale_to_8_bit(image)
 
-        expected_image = np.array([[[0,31,63],[95,127,159],[191,223,255]]])
+        # Casting to 8 bit truncates
+        expected_image = np.linspace(0, 255, 9).astype(np.uint8).reshape(1, 3, 3)
 
         np.testing.assert_array_equal(result_image, expected_image)